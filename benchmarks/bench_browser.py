@@ -0,0 +1,209 @@
+"""比較完整瀏覽與精簡瀏覽模式載入列表頁的傳輸量與就緒時間
+
+精簡模式依來源的資源政策封鎖圖片、媒體、字型與分析腳本，並使用 eager 載入策略。
+本機伺服器提供 fixtures/ 的列表頁，並在頁面中加入圖片、影片、字型、樣式表與分析腳本，
+靜態資源可設定延遲以模擬實際網路；伺服器統計每次載入實際送出的位元組數與請求數，
+另列出爬蟲 page_bytes_total 指標 (瀏覽器回報的傳輸量) 供對照。需要本機可啟動 Chrome。
+
+用法: python benchmarks/bench_browser.py --repeat 5 --asset-delay 0.05 --output browser.json
+"""
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pipeline import FIXTURES, current_commit, percentile, render_page
+from selenium_scholarship import HostRateLimiter, ScholarshipCrawler
+
+# 模式 -> 爬蟲設定
+MODES = {
+    "full": {"lean_browser": False, "page_load_strategy": "normal"},
+    "lean": {"lean_browser": True, "page_load_strategy": "eager"}
+}
+
+# 路徑 -> (Content-Type, 大小)
+ASSETS = {
+    "/static/site.css": ("text/css", 0),
+    "/static/font.woff2": ("font/woff2", 96 * 1024),
+    "/static/bg.png": ("image/png", 64 * 1024),
+    "/static/intro.mp4": ("video/mp4", 512 * 1024),
+    "/analytics/gtag/js": ("application/javascript", 48 * 1024)
+}
+ASSETS.update({f"/static/banner-{i}.jpg": ("image/jpeg", 128 * 1024) for i in range(6)})
+
+SITE_CSS = b"""@font-face { font-family: "Bench"; src: url("/static/font.woff2") format("woff2"); }
+body { font-family: "Bench", sans-serif; background: url("/static/bg.png"); }
+"""
+
+HEAD_ASSETS = b'<link rel="stylesheet" href="/static/site.css"><script async src="/analytics/gtag/js?id=G-BENCH"></script>'
+BODY_ASSETS = b"".join(f'<img src="/static/banner-{i}.jpg" alt="">'.encode() for i in range(6)) + \
+    b'<video preload="auto" src="/static/intro.mp4"></video>'
+
+class HeavyFixtureServer:
+    """提供加入大型資源的快照頁面，並統計送出的位元組數與請求數"""
+    def __init__(self, asset_delay=0.0):
+        pages = {}
+        stats = {"bytes": 0, "requests": 0}
+        lock = threading.Lock()
+        names = {filename.split(".")[0]: source_name for source_name, (filename, _) in FIXTURES.items()}
+        self.stats = stats
+        self.lock = lock
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                segments = parts.path.strip("/").split("/")
+                status, content_type, body = 404, "text/plain", b""
+                if parts.path in ASSETS:
+                    content_type, size = ASSETS[parts.path]
+                    status, body = 200, SITE_CSS if parts.path == "/static/site.css" else bytes(size)
+                    time.sleep(asset_delay)
+                elif len(segments) == 3 and segments[0] in names and segments[2] == "list":
+                    page = int(parse_qs(parts.query).get("page", ["1"])[0])
+                    key = (segments[0], page)
+                    with lock:
+                        if key not in pages:
+                            html = render_page(names[segments[0]], int(segments[1].lstrip("x")), page)
+                            pages[key] = html.replace(b"</head>", HEAD_ASSETS + b"</head>", 1) \
+                                             .replace(b"</body>", BODY_ASSETS + b"</body>", 1)
+                    status, content_type, body = 200, "text/html; charset=utf-8", pages[key]
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                # 不讓瀏覽器快取，每次載入都實際傳輸
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                    sent = len(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    sent = 0
+                with lock:
+                    stats["bytes"] += sent
+                    stats["requests"] += 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def list_url(self, source_name, page=1):
+        stem = FIXTURES[source_name][0].split(".")[0]
+        return f"{self.base_url}/{stem}/x1/list?page={page}"
+
+    def take_stats(self):
+        """回傳並歸零目前的統計"""
+        with self.lock:
+            taken = dict(self.stats)
+            self.stats.update(bytes=0, requests=0)
+        return taken
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def browser_bytes(crawler, source_name):
+    """爬蟲 page_bytes_total 指標中該來源目前的累計值"""
+    for counter in crawler.metrics.snapshot()["counters"]:
+        if counter["name"] == "page_bytes_total" and counter["labels"].get("source") == source_name:
+            return counter["value"]
+    return 0
+
+def run_mode(server, mode, repeat):
+    """以指定模式載入每個來源的列表頁 repeat 次 (另有一次暖身)"""
+    crawler = ScholarshipCrawler(pool_size=1, backend="selenium")
+    for name, value in MODES[mode].items():
+        setattr(crawler, name, value)
+    crawler.rate_limiter = HostRateLimiter(max_concurrency=1, requests_per_second=0)
+    results = []
+    try:
+        for source_name in FIXTURES:
+            url = server.list_url(source_name)
+            timings, served, requests, reported = [], [], [], []
+            for run in range(repeat + 1):
+                # 等上一次載入殘留的請求結束再歸零統計
+                time.sleep(0.2)
+                server.take_stats()
+                before = browser_bytes(crawler, source_name)
+                start = time.perf_counter()
+                with crawler.open_page(source_name, url):
+                    elapsed = time.perf_counter() - start
+                stats = server.take_stats()
+                if run == 0:
+                    continue
+                timings.append(elapsed)
+                served.append(stats["bytes"])
+                requests.append(stats["requests"])
+                reported.append(browser_bytes(crawler, source_name) - before)
+            results.append({
+                "mode": mode,
+                "source": source_name,
+                "runs": repeat,
+                "p50_ms": percentile(timings, 0.5) * 1000,
+                "p90_ms": percentile(timings, 0.9) * 1000,
+                "served_kb": percentile(served, 0.5) / 1024,
+                "browser_kb": percentile(reported, 0.5) / 1024,
+                "requests": percentile(requests, 0.5)
+            })
+            print(f"完成 {mode} {source_name}", file=sys.stderr)
+    finally:
+        crawler.close()
+    return results
+
+def print_table(results):
+    print(f"{'模式':<8}{'來源':<8}{'就緒 p50 ms':>14}{'p90 ms':>10}{'伺服器 KB':>12}{'瀏覽器 KB':>12}{'請求數':>8}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['source']:<8}{r['p50_ms']:>14.1f}{r['p90_ms']:>10.1f}"
+              f"{r['served_kb']:>12.1f}{r['browser_kb']:>12.1f}{r['requests']:>8}")
+
+    by_key = {(r["mode"], r["source"]): r for r in results}
+    print()
+    for source_name in FIXTURES:
+        full, lean = by_key.get(("full", source_name)), by_key.get(("lean", source_name))
+        if full and lean and full["served_kb"] and full["p50_ms"]:
+            print(f"{source_name}: 傳輸量減少 {(1 - lean['served_kb'] / full['served_kb']) * 100:.1f}%，"
+                  f"就緒時間減少 {(1 - lean['p50_ms'] / full['p50_ms']) * 100:.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--repeat", type=int, default=5, help="每個來源的載入次數 (另有一次暖身)")
+    parser.add_argument("--asset-delay", type=float, default=0.05, help="每個靜態資源回應前的延遲秒數")
+    parser.add_argument("--output", help="將結果保存為 JSON")
+    args = parser.parse_args()
+
+    server = HeavyFixtureServer(args.asset_delay)
+    try:
+        results = [r for mode in args.modes for r in run_mode(server, mode, args.repeat)]
+    finally:
+        server.close()
+    print_table(results)
+
+    if args.output:
+        report = {
+            "meta": {
+                "commit": current_commit(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "asset_delay": args.asset_delay
+            },
+            "results": results
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"結果已保存到 {args.output}")
+
+if __name__ == "__main__":
+    main()
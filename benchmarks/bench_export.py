@@ -0,0 +1,93 @@
+"""比較原本以 pandas 建立 DataFrame 的 Excel 匯出與各種串流匯出的耗時與記憶體
+
+用法: python benchmarks/bench_export.py --rows 100000 [--memory]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import EXPORTERS, Scholarship
+
+def generate(rows):
+    """以產生器提供資料，模擬一邊爬取一邊匯出"""
+    for i in range(rows):
+        yield Scholarship(
+            title=f"113學年度 第{i}號 研究生獎助學金 申請公告",
+            url=f"https://www.csie.ntu.edu.tw/zh_tw/Announcements/11/{i}",
+            source=("生輔組", "資工系", "僑陸組")[i % 3],
+            date=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            status="開放申請",
+            category="研究生"
+        )
+
+def legacy_excel(scholarships, path):
+    """原本 save_to_excel 的做法：整批轉成 DataFrame，再逐格計算欄寬"""
+    import pandas as pd
+    
+    data = []
+    for scholarship in scholarships:
+        data.append({
+            'title': scholarship.title,
+            'source': scholarship.source,
+            'date': scholarship.date,
+            'status': scholarship.status,
+            'category': scholarship.category,
+            'url': scholarship.url,
+            'description': scholarship.description,
+            'deadline': scholarship.deadline,
+            'amount': scholarship.amount,
+            'contact': scholarship.contact,
+            'crawl_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+    df = pd.DataFrame(data)
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='獎學金列表', index=False)
+        worksheet = writer.sheets['獎學金列表']
+        for column in worksheet.columns:
+            max_length = max(len(str(cell.value)) for cell in column)
+            worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+    return len(data)
+
+def measure(label, exporter, rows, path, trace_memory):
+    """計時；trace_memory 時另外以 tracemalloc 再跑一次量測峰值記憶體 (會拖慢執行)"""
+    try:
+        start = time.perf_counter()
+        count = exporter(generate(rows), path)
+        elapsed = time.perf_counter() - start
+        
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            exporter(generate(rows), path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    except (ImportError, RuntimeError) as e:
+        print(f"{label:>16}: 略過 ({e})")
+        return
+    
+    size = os.path.getsize(path) / 1024 / 1024
+    memory = f"  峰值記憶體 {peak / 1024 / 1024:7.1f} MB" if peak is not None else ""
+    print(f"{label:>16}: {elapsed:7.2f}s{memory}  檔案 {size:6.1f} MB  ({count} 筆)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--memory", action="store_true", help="另外量測峰值記憶體")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.skip_legacy:
+            measure("legacy .xlsx", legacy_excel, args.rows, os.path.join(tmp, "legacy.xlsx"), args.memory)
+        for extension, exporter in EXPORTERS.items():
+            measure(f"stream {extension}", exporter, args.rows, os.path.join(tmp, f"out{extension}"), args.memory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""比較逐一查詢元素、execute_script 快照與 page_source 三種解析方式的耗時
+
+需要本機可啟動 Chrome。用法: python benchmarks/bench_extraction.py --rows 300 --repeat 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.webdriver.common.by import By
+from selenium_scholarship import ScholarshipCrawler
+
+TITLES = [
+    "113學年度 僑生獎學金 申請公告",
+    "碩士班 研究生獎助學金 開放申請",
+    "系務會議紀錄",
+    "清寒學生助學金 即將截止",
+    "International Student Scholarship",
+    "實驗室安全講習"
+]
+
+def build_page(rows):
+    """產生含 rows 列公告的表格頁面"""
+    lines = ["<html><head><meta charset='utf-8'></head><body><table class='table'><tbody>"]
+    for i in range(rows):
+        title = TITLES[i % len(TITLES)]
+        lines.append(
+            f"<tr><td><a href='/news/{i}'>{title} #{i}</a></td>"
+            f"<td><small>公告</small></td><td><span class='date'>2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}</span></td></tr>"
+        )
+    lines.append("</tbody></table></body></html>")
+    return "\n".join(lines)
+
+def measure(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    crawler = ScholarshipCrawler(pool_size=1)
+    with tempfile.NamedTemporaryFile("w", suffix=".html", delete=False, encoding="utf-8") as f:
+        f.write(build_page(args.rows))
+    
+    try:
+        with crawler.driver_pool.session() as driver:
+            driver.get(Path(f.name).as_uri())
+            query = (By.CSS_SELECTOR, "table.table tbody tr")
+            items = driver.find_elements(*query)
+            
+            results = {}
+            for mode in ("element", "snapshot", "page_source"):
+                crawler.extraction = mode
+                elapsed, parsed = measure(lambda: crawler.parse_items(driver, items, query, "資工系"), args.repeat)
+                results[mode] = (elapsed, parsed)
+                print(f"{mode:>12}: {elapsed:.3f}s ({len(parsed)} 筆)")
+            
+            baseline, expected = results["element"]
+            for mode in ("snapshot", "page_source"):
+                elapsed, parsed = results[mode]
+                if [s.title for s in parsed] != [s.title for s in expected]:
+                    print(f"警告: {mode} 的解析結果與逐一查詢不同")
+                print(f"{mode} 相對逐一查詢加速 {baseline / elapsed:.1f}x")
+    finally:
+        crawler.close()
+        os.unlink(f.name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""比較逐一比對關鍵字清單與預先編譯的 KeywordMatcher 的分類耗時
+
+用法: python benchmarks/bench_matcher.py --titles 100000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import (
+    ANY_DATE_PATTERN, CATEGORY_KEYWORDS, LEVEL_KEYWORDS, SCHOLARSHIP_KEYWORDS, STATUS_KEYWORDS,
+    Identity, KeywordMatcher
+)
+
+FRAGMENTS = [
+    "113學年度", "第二學期", "僑生", "外籍", "碩士班", "博士班", "大學部", "研究所",
+    "清寒", "績優", "獎學金", "獎助學金", "助學金", "補助", "申請中", "截止", "即將",
+    "審核", "公告", "說明會", "系務會議", "International", "Graduate", "PhD", "Scholarship",
+    "Overseas", "undergraduate", "實驗室", "課程異動", "教育基金會", "學費減免", "受理中"
+]
+
+def build_corpus(size, seed=42):
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(FRAGMENTS, rng.randint(2, 6))) for _ in range(size)]
+
+def legacy_classify(text):
+    """原本的寫法：每個表各自以 any(keyword in text) 掃描一次"""
+    lower = text.lower()
+    relevant = any(keyword in lower for keyword in SCHOLARSHIP_KEYWORDS)
+    status = next((s for s, keywords in STATUS_KEYWORDS.items() if any(k in lower for k in keywords)), "")
+    categories = tuple(c for c, keywords in CATEGORY_KEYWORDS.items() if any(k in lower for k in keywords))
+    levels = frozenset(level for level, keywords in LEVEL_KEYWORDS.items() if any(k in lower for k in keywords))
+    identities = set()
+    if "僑生" in lower or "overseas" in lower:
+        identities.add(Identity.OVERSEAS_CHINESE)
+    if "外籍" in lower or "international" in lower:
+        identities.add(Identity.INTERNATIONAL)
+    non_local = "僑生" in lower or "外籍" in lower
+    date_patterns = [
+        r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',
+        r'\d{1,2}[-/]\d{1,2}[-/]\d{4}',
+        r'\d{4}年\d{1,2}月\d{1,2}日',
+        r'\d{4}\.\d{1,2}\.\d{1,2}'
+    ]
+    any(re.search(pattern, text) for pattern in date_patterns)
+    return relevant, status, categories, levels, frozenset(identities), non_local
+
+def timed(label, func, corpus):
+    start = time.perf_counter()
+    results = [func(title) for title in corpus]
+    elapsed = time.perf_counter() - start
+    print(f"{label:>10}: {elapsed:.3f}s ({len(corpus) / elapsed:,.0f} 標題/秒)")
+    return elapsed, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=100000)
+    args = parser.parse_args()
+    
+    corpus = build_corpus(args.titles)
+    matcher = KeywordMatcher()
+    
+    def compiled(text):
+        result = matcher.classify(text)
+        ANY_DATE_PATTERN.search(text)
+        return result.relevant, result.status, result.categories, result.levels, result.identities, result.non_local
+    
+    legacy_time, expected = timed("legacy", legacy_classify, corpus)
+    compiled_time, actual = timed("compiled", compiled, corpus)
+    
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    print(f"結果不一致: {mismatches} 筆")
+    print(f"加速 {legacy_time / compiled_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""以本機 HTTP 伺服器重播三個來源的列表頁快照，量測完整搜尋流程與各階段的效能
+
+fixtures/ 中的頁面可放大為 10 倍、100 倍的列數；每個 (階段, 倍數) 在獨立的子行程中執行，
+回報吞吐量、延遲百分位數與該行程的 RSS 峰值。以 --output 保存結果 (含 commit)，
+再以 --compare 與其他 commit 的結果比較。
+
+用法: python benchmarks/bench_pipeline.py --scales 1 10 100 --output before.json
+      python benchmarks/bench_pipeline.py --compare before.json
+"""
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import (
+    HostRateLimiter, HtmlPage, Identity, Level, ScholarshipFinder, StudyType, UserInput, lxml_html
+)
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# 來源 -> (快照檔, 列表項目的 XPath)
+FIXTURES = {
+    "生輔組": ("student_affairs.html", "//table[contains(@class, 'table')]/tbody/tr"),
+    "資工系": ("csie.html", "//div[contains(@class, 'announcement-list')]/div[contains(@class, 'item')]"),
+    "僑陸組": ("overseas_affairs.html", "//div[contains(@class, 'content-list')]/div[contains(@class, 'item')]")
+}
+
+STAGES = ["pipeline", "extraction", "filter", "export"]
+
+# 三個來源都會被爬取的查詢條件
+USER_INPUT = UserInput("資工系", Level.MASTER, 2, Identity.OVERSEAS_CHINESE, StudyType.FULL_TIME)
+
+def render_page(source_name, scale, page):
+    """將快照的列表項目複製 scale 倍，每頁與每份複本的連結都不同，並改寫分頁連結指向本機"""
+    filename, rows_xpath = FIXTURES[source_name]
+    document = lxml_html.fromstring((FIXTURES_DIR / filename).read_bytes())
+    rows = document.xpath(rows_xpath)
+    parent = rows[0].getparent()
+    for row in rows:
+        parent.remove(row)
+    for copy_index in range(scale):
+        for row in rows:
+            clone = copy.deepcopy(row)
+            for link in clone.iter("a"):
+                href = link.get("href", "")
+                link.set("href", f"{href}{'&' if '?' in href else '?'}p={page}&c={copy_index}")
+            parent.append(clone)
+
+    list_path = f"/{filename.split('.')[0]}/x{scale}/list"
+    for link in document.xpath("//*[contains(@class, 'pag')]//a | //a[contains(@class, 'next')]"):
+        text = link.text_content().strip()
+        number = int(text) if text.isdigit() else page + 1
+        link.set("href", f"{list_path}?page={number}")
+    return lxml_html.tostring(document, encoding="utf-8", doctype="<!DOCTYPE html>")
+
+class FixtureServer:
+    """在背景執行緒提供放大後的快照頁面，頁面產生後即保留在記憶體"""
+    def __init__(self):
+        pages = {}
+        lock = threading.Lock()
+        names = {filename.split(".")[0]: source_name for source_name, (filename, _) in FIXTURES.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                segments = parts.path.strip("/").split("/")
+                if len(segments) != 3 or segments[0] not in names or segments[2] != "list":
+                    self.send_error(404)
+                    return
+                scale = int(segments[1].lstrip("x"))
+                page = int(parse_qs(parts.query).get("page", ["1"])[0])
+                key = (segments[0], scale, page)
+                with lock:
+                    if key not in pages:
+                        pages[key] = render_page(names[segments[0]], scale, page)
+                body = pages[key]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def list_url(self, source_name, scale, page=1):
+        stem = FIXTURES[source_name][0].split(".")[0]
+        return f"{self.base_url}/{stem}/x{scale}/list?page={page}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def make_finder(server, scale):
+    """指向本機伺服器、以 HTTP 抓取且不限速的 ScholarshipFinder"""
+    finder = ScholarshipFinder()
+    crawler = finder.crawler
+    crawler.backend = "http"
+    crawler.rate_limiter = HostRateLimiter(max_concurrency=8, requests_per_second=0)
+    for source_name in FIXTURES:
+        crawler.sources[source_name].url = server.list_url(source_name, scale)
+        crawler.sources[source_name].base_url = server.base_url
+    return finder
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 回報，macOS 以 bytes 回報
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_stage(stage, scale, repeat):
+    """在目前行程執行單一階段，回傳每次的耗時與處理的項目數"""
+    server = FixtureServer()
+    finder = make_finder(server, scale)
+    crawler = finder.crawler
+    timings = []
+    items_per_run = 0
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            if stage == "pipeline":
+                def run():
+                    result = finder.search_scholarships(USER_INPUT, max_pages_per_source=3, parallel=True)
+                    return sum(report["count"] for report in result["sources"].values())
+            elif stage == "extraction":
+                import requests
+                pages = [(source_name, HtmlPage(server.list_url(source_name, scale),
+                                                requests.get(server.list_url(source_name, scale)).content))
+                         for source_name in FIXTURES]
+
+                def run():
+                    count = 0
+                    for source_name, page in pages:
+                        fresh = HtmlPage(page.current_url, page.page_source)
+                        count += len(crawler.parse_list_page(crawler.sources[source_name], fresh))
+                    return count
+            else:
+                scholarships = []
+                for source_name in FIXTURES:
+                    scholarships.extend(crawler.crawl_source(source_name, max_pages=3))
+                if stage == "filter":
+                    def run():
+                        crawler.filter_scholarships(scholarships, USER_INPUT)
+                        return len(scholarships)
+                else:
+                    output_dir = tempfile.mkdtemp()
+
+                    def run():
+                        finder.save_to_excel(scholarships, os.path.join(output_dir, "bench.xlsx"))
+                        return len(scholarships)
+
+            # 第一次執行為暖身，不列入結果
+            run()
+            for _ in range(repeat):
+                start = time.perf_counter()
+                items_per_run = run()
+                timings.append(time.perf_counter() - start)
+    finally:
+        finder.close()
+        server.close()
+    return {"stage": stage, "scale": scale, "timings": timings, "items": items_per_run, "peak_rss_mb": peak_rss_mb()}
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(raw):
+    timings = raw["timings"]
+    total = sum(timings)
+    return {
+        "stage": raw["stage"],
+        "scale": raw["scale"],
+        "runs": len(timings),
+        "items": raw["items"],
+        "items_per_sec": raw["items"] * len(timings) / total if total else 0.0,
+        "p50_ms": percentile(timings, 0.5) * 1000,
+        "p90_ms": percentile(timings, 0.9) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "peak_rss_mb": raw["peak_rss_mb"]
+    }
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_table(results, baseline=None):
+    header = f"{'階段':<12}{'倍數':>6}{'項目':>8}{'項目/秒':>12}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'RSS MB':>9}"
+    if baseline:
+        header += f"{'p50 變化':>10}"
+    print(header)
+    previous = {(r["stage"], r["scale"]): r for r in (baseline or {}).get("results", [])}
+    for r in results:
+        line = (f"{r['stage']:<12}{r['scale']:>6}{r['items']:>8}{r['items_per_sec']:>12,.0f}"
+                f"{r['p50_ms']:>10.1f}{r['p90_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['peak_rss_mb']:>9.1f}")
+        before = previous.get((r["stage"], r["scale"]))
+        if before:
+            line += f"{(r['p50_ms'] / before['p50_ms'] - 1) * 100:>+9.1f}%"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=10, help="每個階段的量測次數 (另有一次暖身)")
+    parser.add_argument("--output", help="將結果保存為 JSON")
+    parser.add_argument("--compare", help="與先前保存的結果比較 p50")
+    parser.add_argument("--child", nargs=2, metavar=("STAGE", "SCALE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        stage, scale = args.child
+        print(json.dumps(run_stage(stage, int(scale), args.repeat)))
+        return
+
+    results = []
+    for scale in args.scales:
+        for stage in args.stages:
+            completed = subprocess.run(
+                [sys.executable, __file__, "--child", stage, str(scale), "--repeat", str(args.repeat)],
+                capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"{stage} x{scale} 執行失敗:\n{completed.stderr}")
+                continue
+            results.append(summarize(json.loads(completed.stdout.strip().splitlines()[-1])))
+            print(f"完成 {stage} x{scale}", file=sys.stderr)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"比較基準: commit {baseline['meta'].get('commit')} ({baseline['meta'].get('created_at')})")
+    print_table(results, baseline)
+
+    if args.output:
+        report = {
+            "meta": {
+                "commit": current_commit(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat
+            },
+            "results": results
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"結果已保存到 {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,49 @@
+import argparse
+import asyncio
+import bisect
+import contextvars
+import csv
+import hashlib
+import itertools
 import json
+import os
+import queue
+import random
 import re
-from typing import List, Dict, Any
-from dataclasses import dataclass
+import sqlite3
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import deque
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Iterable, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
+from dataclasses import dataclass, asdict, field, replace
 from enum import Enum
 from selenium import webdriver
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchElementException, NoSuchWindowException, TimeoutException, WebDriverException
+)
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
+import tempfile
 import time
-from datetime import datetime
+from datetime import datetime, date as Date
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from lxml import html as lxml_html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # 未安裝時只能使用 Selenium
+    requests = None
+    lxml_html = None
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 class Level(Enum):
     BACHELOR = "學士"
@@ -52,15 +84,1509 @@ class Scholarship:
     deadline: str = ""
     amount: str = ""
     contact: str = ""
+    # 解析後的公告日期與截止日期，無法解析時為 None
+    published_on: Date = None
+    deadline_on: Date = None
+    # 合併重複項目後，所有公告此項目的來源 (空值表示只有 source)
+    sources: Tuple[str, ...] = ()
 
-class ScholarshipCrawler:
+@dataclass
+class ReadyCondition:
+    """頁面就緒條件：列表容器出現且達到最少筆數，可選擇等待網路閒置"""
+    selector: str = ""
+    min_count: int = 1
+    network_idle: bool = False
+    idle_time: float = 0.5
+    timeout: float = 10
+    poll_interval: float = 0.1
+
+_NETWORK_IDLE_SCRIPT = """
+const entries = performance.getEntriesByType('resource');
+let lastEnd = 0;
+for (const entry of entries) {
+    lastEnd = Math.max(lastEnd, entry.responseEnd || entry.startTime);
+}
+return performance.now() - lastEnd;
+"""
+
+# 目前頁面 (含已載入的資源) 經網路傳輸的位元組數
+_TRANSFER_SIZE_SCRIPT = """
+let total = 0;
+for (const entry of performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))) {
+    total += entry.transferSize || 0;
+}
+return total;
+"""
+
+# 精簡瀏覽模式可封鎖的資源類型，以 Network.setBlockedURLs 的萬用字元樣式表示
+RESOURCE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.wav*", "*.m4a*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "stylesheet": ["*.css*"],
+    "analytics": ["*google-analytics.com*", "*googletagmanager.com*", "*gtag/js*", "*doubleclick.net*",
+                  "*connect.facebook.net*", "*hotjar.com*", "*clarity.ms*"]
+}
+
+@dataclass
+class ResourcePolicy:
+    """精簡瀏覽模式下不載入的資源
+    
+    block 為 RESOURCE_PATTERNS 中的類型，deny 為額外封鎖的網址樣式；
+    allow 可列出類型或樣式，使其照常載入 (Chrome 的封鎖清單沒有例外規則，只能整條移除)。
+    """
+    block: List[str] = field(default_factory=lambda: ["image", "media", "font", "analytics"])
+    deny: List[str] = field(default_factory=list)
+    allow: List[str] = field(default_factory=list)
+    
+    def blocked_urls(self) -> List[str]:
+        patterns = [pattern for kind in self.block if kind not in self.allow for pattern in RESOURCE_PATTERNS[kind]]
+        return [pattern for pattern in patterns + self.deny if pattern not in self.allow]
+
+# 來源設定檔，新增來源只需在此檔加入一筆設定
+SOURCES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources.json")
+
+_QUERY_TYPES = {"css": By.CSS_SELECTOR, "xpath": By.XPATH, "tag": By.TAG_NAME}
+
+@dataclass
+class SourceConfig:
+    """來源設定：列表網址、候選選擇器、就緒條件、分頁規則、相對連結的基底網址與抓取方式
+    
+    selectors 依序嘗試，第一個找到至少 min_items 個項目的即為列表；都找不到時使用 fallback。
+    identities / departments 限制來源適用的用戶，未設定時適用所有人。
+    refresh_interval 為常駐服務重新爬取此來源的間隔秒數。
+    resources 為以 Selenium 載入時不需要的資源。
+    """
+    name: str
+    url: str
+    base_url: str = ""
+    selectors: List[str] = field(default_factory=list)
+    min_items: int = 1
+    fallback: Tuple[str, str] = None
+    ready: ReadyCondition = field(default_factory=ReadyCondition)
+    page_url_pattern: str = None
+    backend: str = "http"
+    cache_ttl: float = None
+    refresh_interval: float = 1800
+    identities: List[Identity] = field(default_factory=list)
+    departments: List[str] = field(default_factory=list)
+    resources: ResourcePolicy = field(default_factory=ResourcePolicy)
+    
+    def applies_to(self, user_input: UserInput) -> bool:
+        """此來源是否適用於用戶"""
+        if self.identities and user_input.identity not in self.identities:
+            return False
+        if self.departments and not any(d in user_input.department for d in self.departments):
+            return False
+        return True
+    
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "SourceConfig":
+        entry = dict(entry)
+        try:
+            fallback = entry.pop("fallback", None)
+            if fallback:
+                entry["fallback"] = (_QUERY_TYPES[fallback["by"]], fallback["value"])
+            entry["ready"] = ReadyCondition(**entry.pop("ready", {}))
+            entry["identities"] = [Identity(value) for value in entry.pop("identities", [])]
+            entry["resources"] = ResourcePolicy(**entry.pop("resources", {}))
+            unknown = set(entry["resources"].block) - set(RESOURCE_PATTERNS)
+            if unknown:
+                raise ValueError(f"未知的資源類型 {', '.join(sorted(unknown))}")
+            if entry.get("backend", "http") not in ("http", "selenium"):
+                raise ValueError(f"未知的抓取方式 {entry['backend']}")
+            return cls(**entry)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"來源設定 {entry.get('name', '?')} 有誤: {e}") from e
+
+def load_sources(path=SOURCES_PATH) -> Dict[str, SourceConfig]:
+    """讀取來源設定檔，依檔案中的順序回傳 名稱 -> SourceConfig"""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    sources = {}
+    for entry in entries:
+        source = SourceConfig.from_dict(entry)
+        sources[source.name] = source
+    return sources
+
+# 關鍵字表：判斷是否與獎學金相關、狀態 (依優先順序)、類別、學位層級與身份
+SCHOLARSHIP_KEYWORDS = [
+    "獎學金", "scholarship", "獎助", "補助", "津貼",
+    "助學", "獎勵", "獎助學金", "教育基金", "學費減免"
+]
+
+STATUS_KEYWORDS = {
+    '開放申請': ['開放', '申請中', '受理中'],
+    '截止': ['截止', '結束', 'closed'],
+    '審核中': ['審核', '評選'],
+    '即將截止': ['即將', 'deadline']
+}
+
+CATEGORY_KEYWORDS = {
+    '研究生': ['研究生', '碩士', '博士', 'graduate'],
+    '大學生': ['大學生', '學士', 'undergraduate'],
+    '清寒': ['清寒', '低收入'],
+    '優秀': ['優秀', '績優'],
+    '僑生': ['僑生'],
+    '外籍生': ['外籍', 'international']
+}
+
+LEVEL_KEYWORDS = {
+    Level.BACHELOR: ["學士", "大學", "undergraduate"],
+    Level.MASTER: ["碩士", "研究所", "master", "graduate"],
+    Level.DOCTOR: ["博士", "phd", "doctoral"]
+}
+
+IDENTITY_KEYWORDS = {
+    Identity.OVERSEAS_CHINESE: ["僑生", "overseas"],
+    Identity.INTERNATIONAL: ["外籍", "international"]
+}
+
+# 標題含有這些字時不適用於本國人
+NON_LOCAL_KEYWORDS = ["僑生", "外籍"]
+
+@dataclass(frozen=True)
+class TextClassification:
+    """一次掃描文字得到的所有關鍵字分類結果"""
+    relevant: bool
+    status: str
+    categories: Tuple[str, ...]
+    levels: frozenset
+    identities: frozenset
+    non_local: bool
+
+class KeywordMatcher:
+    """將所有關鍵字表編譯成單一正規表示式，一次掃描即完成分類
+    
+    以 lookahead 在每個位置找出最長的關鍵字，並讓它同時帶有所有為其前綴的
+    關鍵字的標籤，因此結果與逐一以 `keyword in text` 判斷相同。
+    """
     def __init__(self):
-        # URLs específicas actualizadas
-        self.target_urls = {
-            "生輔組": "https://advisory.ntu.edu.tw/CMS/Scholarship?pageId=232",
-            "資工系": "https://www.csie.ntu.edu.tw/zh_tw/Announcements/11", 
-            "僑陸組": "https://gocfs.ntu.edu.tw/board/index/tab/1"
+        tags = {}
+        
+        def add(keyword, tag):
+            tags.setdefault(keyword.lower(), set()).add(tag)
+        
+        for keyword in SCHOLARSHIP_KEYWORDS:
+            add(keyword, ("relevant", None))
+        for status, keywords in STATUS_KEYWORDS.items():
+            for keyword in keywords:
+                add(keyword, ("status", status))
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            for keyword in keywords:
+                add(keyword, ("category", category))
+        for level, keywords in LEVEL_KEYWORDS.items():
+            for keyword in keywords:
+                add(keyword, ("level", level))
+        for identity, keywords in IDENTITY_KEYWORDS.items():
+            for keyword in keywords:
+                add(keyword, ("identity", identity))
+        for keyword in NON_LOCAL_KEYWORDS:
+            add(keyword, ("non_local", None))
+        
+        # 每個標籤對應一個位元；同一位置只會取到最長的關鍵字，所以要併入其前綴關鍵字的位元
+        self.tag_list = sorted({tag for tag_set in tags.values() for tag in tag_set}, key=repr)
+        bits = {tag: 1 << i for i, tag in enumerate(self.tag_list)}
+        self.masks = {}
+        for keyword in tags:
+            mask = 0
+            for other, other_tags in tags.items():
+                if keyword.startswith(other):
+                    for tag in other_tags:
+                        mask |= bits[tag]
+            self.masks[keyword] = mask
+        
+        self.pattern = re.compile("(?=(" + self._trie_pattern(list(tags)) + "))")
+        self.relevant_bit = bits[("relevant", None)]
+        self.non_local_bit = bits[("non_local", None)]
+        self.status_bits = [(bits[("status", s)], s) for s in STATUS_KEYWORDS]
+        self.category_bits = [(bits[("category", c)], c) for c in CATEGORY_KEYWORDS]
+        self.level_bits = [(bits[("level", level)], level) for level in LEVEL_KEYWORDS]
+        self.identity_bits = [(bits[("identity", identity)], identity) for identity in IDENTITY_KEYWORDS]
+        self._cache = {}
+    
+    @classmethod
+    def _trie_pattern(cls, keywords):
+        """將關鍵字整理成前綴樹形式的正規表示式，較長的分支優先"""
+        groups = {}
+        ends_here = False
+        for keyword in keywords:
+            if keyword:
+                groups.setdefault(keyword[0], []).append(keyword[1:])
+            else:
+                ends_here = True
+        if not groups:
+            return ""
+        
+        branches = [re.escape(first) + cls._trie_pattern(rest) for first, rest in sorted(groups.items())]
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if ends_here else pattern
+    
+    def classify(self, text) -> TextClassification:
+        mask = 0
+        masks = self.masks
+        for match in self.pattern.finditer(text.lower()):
+            mask |= masks[match.group(1)]
+        
+        result = self._cache.get(mask)
+        if result is None:
+            result = self._cache[mask] = TextClassification(
+                relevant=bool(mask & self.relevant_bit),
+                status=next((s for bit, s in self.status_bits if mask & bit), ""),
+                categories=tuple(c for bit, c in self.category_bits if mask & bit),
+                levels=frozenset(level for bit, level in self.level_bits if mask & bit),
+                identities=frozenset(identity for bit, identity in self.identity_bits if mask & bit),
+                non_local=bool(mask & self.non_local_bit)
+            )
+        return result
+
+KEYWORD_MATCHER = KeywordMatcher()
+
+@lru_cache(maxsize=8192)
+def classify_text(text) -> TextClassification:
+    """分類文字 (結果會被快取，重複出現的標題不需重新掃描)"""
+    return KEYWORD_MATCHER.classify(text)
+
+# 依優先順序嘗試的日期格式，以及任一格式的合併版本
+# 民國年只接受 80~149 年；以點分隔的民國日期須冠上「民國」，避免把版本號之類的數字當成日期
+_ROC_YEAR = r'(?<![\d.])(?:民國\s*)?(?:1[0-4]\d|[89]\d)'
+_ROC_DOTTED_YEAR = r'民國\s*(?:1[0-4]\d|[89]\d)'
+DATE_PATTERNS = [
+    re.compile(r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})'),
+    re.compile(r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})'),
+    re.compile(r'(\d{4}年\d{1,2}月\d{1,2}日)'),
+    re.compile(r'(\d{4}\.\d{1,2}\.\d{1,2})'),
+    re.compile(r'(' + _ROC_YEAR + r'[-/]\d{1,2}[-/]\d{1,2}(?![\d.]))'),
+    re.compile(r'(' + _ROC_DOTTED_YEAR + r'\.\d{1,2}\.\d{1,2}(?![\d.]))'),
+    re.compile(r'(' + _ROC_YEAR + r'\s*年\s*\d{1,2}\s*月\s*\d{1,2}\s*日)')
+]
+ANY_DATE_PATTERN = re.compile("|".join(p.pattern for p in DATE_PATTERNS))
+
+# (pattern, (年, 月, 日 的群組), 年份偏移)；民國年加 1911
+_DATE_PARSE_PATTERNS = [
+    (re.compile(r'(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})'), (1, 2, 3), 0),
+    (re.compile(r'(\d{1,2})[-/](\d{1,2})[-/](\d{4})'), (3, 1, 2), 0),
+    (re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日'), (1, 2, 3), 0),
+    (re.compile(r'(?<![\d.])(?:民國\s*)?(1[0-4]\d|[89]\d)[-/](\d{1,2})[-/](\d{1,2})(?![\d.])'), (1, 2, 3), 1911),
+    (re.compile(r'民國\s*(1[0-4]\d|[89]\d)\.(\d{1,2})\.(\d{1,2})(?![\d.])'), (1, 2, 3), 1911),
+    (re.compile(r'(?<![\d.])(?:民國\s*)?(1[0-4]\d|[89]\d)\s*年\s*(\d{1,2})\s*月\s*(\d{1,2})\s*日'), (1, 2, 3), 1911)
+]
+
+@lru_cache(maxsize=8192)
+def parse_date(text):
+    """將日期文字 (含民國年) 轉為 date，無法解析時回傳 None"""
+    for pattern, (y, m, d), offset in _DATE_PARSE_PATTERNS:
+        match = pattern.search(text or "")
+        if match:
+            try:
+                return Date(int(match.group(y)) + offset, int(match.group(m)), int(match.group(d)))
+            except ValueError:
+                continue
+    return None
+
+def scholarship_record(scholarship: Scholarship) -> Dict[str, Any]:
+    """可序列化為 JSON 的 dict，日期欄位轉為 ISO 格式"""
+    record = asdict(scholarship)
+    for name in ("published_on", "deadline_on"):
+        if record[name] is not None:
+            record[name] = record[name].isoformat()
+    return record
+
+def scholarship_from_record(record: Dict[str, Any]) -> Scholarship:
+    """由 scholarship_record 的結果還原；舊紀錄沒有日期欄位時由文字解析"""
+    record = dict(record)
+    for name, text_field in (("published_on", "date"), ("deadline_on", "deadline")):
+        value = record.get(name)
+        record[name] = Date.fromisoformat(value) if value else parse_date(record.get(text_field, ""))
+    record["sources"] = tuple(record.get("sources", ()))
+    return Scholarship(**record)
+
+def posted_by(scholarship: Scholarship) -> Tuple[str, ...]:
+    """公告此項目的所有來源"""
+    return scholarship.sources or (scholarship.source,)
+
+# 標題含有這些字時，關鍵字判斷出的「截止」其實是即將截止或延長截止
+_STILL_OPEN_HINTS = ("即將", "延長")
+
+def is_closed_by_status(scholarship: Scholarship) -> bool:
+    """截止日期不明時，依狀態判斷是否已截止"""
+    return scholarship.status == "截止" and not any(hint in scholarship.title for hint in _STILL_OPEN_HINTS)
+
+def is_still_open(scholarship: Scholarship, today: Date = None) -> bool:
+    """截止日期已知時以其判斷是否未過，否則依狀態判斷"""
+    if scholarship.deadline_on is not None:
+        return scholarship.deadline_on >= (today or Date.today())
+    return not is_closed_by_status(scholarship)
+
+def filter_by_date(scholarships: Iterable[Scholarship], since: Date = None, until: Date = None,
+                   open_only=False, today: Date = None) -> List[Scholarship]:
+    """依公告日期範圍與是否仍可申請篩選；公告日期不明的項目保留"""
+    today = today or Date.today()
+    return [
+        s for s in scholarships
+        if (s.published_on is None or
+            ((since is None or s.published_on >= since) and (until is None or s.published_on <= until)))
+        and (not open_only or is_still_open(s, today))
+    ]
+
+# 詳細頁欄位：每個欄位依序嘗試，第一個符合的即為結果 (取第 1 組)
+_DATE_TEXT = r'\d{2,4}\s*[-/.年]\s*\d{1,2}\s*[-/.月]\s*\d{1,2}\s*日?'
+_AMOUNT_TEXT = r'(?:新[臺台]幣|NT\$|NTD)?\s*\d[\d,]*(?:\.\d+)?\s*萬?\s*元'
+DETAIL_PATTERNS = {
+    "deadline": [
+        re.compile(r'(?:截止日期|申請截止|收件截止|截止時間|申請期限|申請期間|申請時間|受理期間|deadline)'
+                   r'\s*[:：]?[^\n\d]{0,10}(?:' + _DATE_TEXT + r'[^\n\d]{0,5}?(?:至|到|~|～|－|-)\s*)?'
+                   r'(' + _DATE_TEXT + r')', re.IGNORECASE),
+        re.compile(r'(' + _DATE_TEXT + r')\s*(?:前|止|截止)')
+    ],
+    "amount": [
+        re.compile(r'(?:獎學金額|獎助金額|補助金額|獎學金金額|金額|獎金|獎助學金)\s*[:：]?[^\n\d]{0,10}?(' + _AMOUNT_TEXT + r')'),
+        re.compile(r'((?:新[臺台]幣|NT\$|NTD)\s*\d[\d,]*(?:\.\d+)?\s*萬?\s*元?)'),
+        re.compile(r'((?:每[名人月學期年]|共)\s*\d[\d,]*(?:\.\d+)?\s*萬?\s*元)')
+    ],
+    "contact": [
+        re.compile(r'(?:聯絡人|承辦人|聯絡方式|聯絡資訊|聯絡電話|洽詢|contact)\s*[:：]\s*([^\n]{2,80})', re.IGNORECASE),
+        re.compile(r'([\w.+-]+@[\w-]+(?:\.[\w-]+)+)'),
+        re.compile(r'(\(?0\d{1,2}\)?[\s-]?\d{3,4}[\s-]?\d{3,4}(?:\s*(?:分機|轉|#|ext\.?)\s*\d+)?)')
+    ]
+}
+
+# 詳細頁主要內容可能使用的選擇器，依序嘗試
+CONTENT_SELECTORS = ["article", "main", "div.content", "#content", "div.post-content", "div.editor", "body"]
+
+def extract_details(text, description_length=500) -> Dict[str, str]:
+    """從詳細頁內文提取截止日期、金額、聯絡方式與摘要"""
+    details = {"description": " ".join(text.split())[:description_length]}
+    for name, patterns in DETAIL_PATTERNS.items():
+        details[name] = ""
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                details[name] = match.group(1).strip()
+                break
+    return details
+
+def normalize_url(url: str) -> str:
+    """正規化網址：小寫主機、去除錨點與追蹤參數、排序查詢參數"""
+    parts = urlsplit(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith("utm_"))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+def scholarship_key(scholarship: Scholarship) -> str:
+    """用於辨識重複項目的鍵：正規化網址，沒有網址時使用來源與標題"""
+    if scholarship.url:
+        return normalize_url(scholarship.url)
+    return f"{scholarship.source}:{' '.join(scholarship.title.split())}"
+
+def scholarship_fingerprint(scholarship: Scholarship) -> str:
+    """項目內容的指紋，用於判斷已看過的項目是否有變更"""
+    content = "\x1f".join([scholarship.title, scholarship.date, scholarship.status, scholarship.category])
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+_SHINGLE_NOISE = re.compile(r'[\W_]+')
+_DIGIT_RUN = re.compile(r'\d+')
+
+# 位元組 -> 8 個位元各自展開成 16 位元欄位的值
+_BYTE_LANES = [sum(1 << (bit * 16) for bit in range(8) if value >> bit & 1) for value in range(256)]
+_LANE_ONES = sum(1 << (bit * 16) for bit in range(64))
+# 位元組 -> 最高位元為 1 時為 "1"，否則為 "0"
+_HIGH_BIT_DIGITS = bytes(b"1"[0] if value & 0x80 else b"0"[0] for value in range(256))
+
+@lru_cache(maxsize=65536)
+def _shingle_lanes(shingle):
+    """shingle 的 64 位元雜湊，每個位元展開成 16 位元的欄位，相加即得各位元為 1 的次數"""
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+    return sum(_BYTE_LANES[byte] << (i * 128) for i, byte in enumerate(digest))
+
+def simhash(text, size=2) -> int:
+    """標題的 64 位元 SimHash：去除空白與標點後取連續 size 個字元為 shingle，適用沒有分詞的中文"""
+    normalized = _SHINGLE_NOISE.sub("", text.lower())
+    shingles = [normalized[i:i + size] for i in range(max(1, len(normalized) - size + 1))]
+    total = sum(map(_shingle_lanes, shingles))
+    # 每個欄位加上 0x8000 減過半門檻，欄位最高位元即表示該位元在過半的 shingle 中為 1
+    total += (0x8000 - len(shingles) // 2 - 1) * _LANE_ONES
+    digits = total.to_bytes(128, "little")[1::2].translate(_HIGH_BIT_DIGITS)
+    return int(digits[::-1], 2)
+
+def _merge_into(kept: Scholarship, duplicate: Scholarship) -> Scholarship:
+    """保留 kept 的內容，空白欄位以 duplicate 補上，並合併來源"""
+    updates = {name: getattr(duplicate, name) for name in
+               ("url", "date", "description", "status", "category", "deadline", "amount", "contact",
+                "published_on", "deadline_on")
+               if not getattr(kept, name) and getattr(duplicate, name)}
+    sources = posted_by(kept) + tuple(source for source in posted_by(duplicate) if source not in posted_by(kept))
+    if len(sources) > 1:
+        updates["sources"] = sources
+    return replace(kept, **updates) if updates else kept
+
+def _duplicate_group(title):
+    """可能互為重複的項目必須相同的部分：標題中的數字 (避免合併不同年度或期別) 與適用的學制、身分與類別"""
+    classification = classify_text(title)
+    return (tuple(_DIGIT_RUN.findall(title)), classification.levels, classification.identities,
+            classification.categories)
+
+def deduplicate(scholarships: Iterable[Scholarship], max_distance=3, max_date_gap=7) -> List[Scholarship]:
+    """合併重複的項目，保留第一次出現的順序
+    
+    正規化網址相同即視為重複；不同來源的項目標題 SimHash 距離不超過 max_distance、
+    標題中的數字與學制、身分、類別分類都相同，且公告日期相差不超過 max_date_gap 天時也視為重複。
+    max_distance 最多為 3，超過時可能漏掉部分重複項目。
+    """
+    scholarships = list(scholarships)
+    all_sources = list(dict.fromkeys(s.source for s in scholarships))
+    merged: List[Scholarship] = []
+    by_key = {}
+    fingerprints = []
+    groups = []
+    # 64 位元切成 4 段，距離不超過 3 的兩個雜湊至少有一段完全相同。候選依 (段, 段值, 分組, 來源) 分桶，
+    # 項目只放在還沒刊登它的來源底下，合併後即從該來源的桶移除，比較時不必略過同來源的項目
+    buckets: Dict[tuple, Dict[int, None]] = {}
+    for scholarship in scholarships:
+        key = scholarship_key(scholarship)
+        position = by_key.get(key)
+        if position is None:
+            fingerprint = simhash(scholarship.title)
+            group = _duplicate_group(scholarship.title)
+            checked = set()
+            for band in range(4):
+                for candidate in buckets.get((band, fingerprint >> (band * 16) & 0xFFFF, group, scholarship.source), ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    other = merged[candidate]
+                    if bin(fingerprint ^ fingerprints[candidate]).count("1") > max_distance:
+                        continue
+                    if scholarship.published_on and other.published_on and \
+                       abs((scholarship.published_on - other.published_on).days) > max_date_gap:
+                        continue
+                    position = candidate
+                    break
+                if position is not None:
+                    break
+        
+        if position is not None:
+            merged[position] = _merge_into(merged[position], scholarship)
+            by_key.setdefault(key, position)
+            for band in range(4):
+                bucket = (band, fingerprints[position] >> (band * 16) & 0xFFFF, groups[position], scholarship.source)
+                buckets.get(bucket, {}).pop(position, None)
+            continue
+        
+        position = len(merged)
+        merged.append(scholarship)
+        fingerprints.append(fingerprint)
+        groups.append(group)
+        by_key[key] = position
+        for source in all_sources:
+            if source != scholarship.source:
+                for band in range(4):
+                    buckets.setdefault((band, fingerprint >> (band * 16) & 0xFFFF, group, source), {})[position] = None
+    return merged
+
+class ScholarshipColumns:
+    """唯讀、以欄保存的獎學金集合，供快照與長期封存使用
+    
+    來源、日期文字、狀態、類別等重複度高的欄位存成字串表的編號，標題、網址等文字欄位
+    各自串接成一個 UTF-8 bytes 並記錄位移，日期存成序數 (0 表示未知)；
+    取用時才還原為 Scholarship，不需為每筆保留物件。
+    """
+    CODED_FIELDS = ("source", "date", "status", "category", "sources")
+    TEXT_FIELDS = ("title", "url", "description", "deadline", "amount", "contact")
+    DATE_FIELDS = ("published_on", "deadline_on")
+    
+    def __init__(self, scholarships: Iterable[Scholarship] = ()):
+        strings = []
+        codes = {}
+        coded = {name: array("I") for name in self.CODED_FIELDS}
+        texts = {name: bytearray() for name in self.TEXT_FIELDS}
+        offsets = {name: array("Q", [0]) for name in self.TEXT_FIELDS}
+        dates = {name: array("i") for name in self.DATE_FIELDS}
+        for scholarship in scholarships:
+            for name in self.CODED_FIELDS:
+                value = getattr(scholarship, name)
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(strings)
+                    strings.append(value)
+                coded[name].append(code)
+            for name in self.TEXT_FIELDS:
+                buffer = texts[name]
+                buffer += getattr(scholarship, name).encode("utf-8")
+                offsets[name].append(len(buffer))
+            for name in self.DATE_FIELDS:
+                value = getattr(scholarship, name)
+                dates[name].append(value.toordinal() if value else 0)
+        
+        self._strings = strings
+        self._coded = coded
+        self._texts = {name: bytes(buffer) for name, buffer in texts.items()}
+        self._offsets = offsets
+        self._dates = dates
+        self._length = len(dates["published_on"])
+    
+    def __len__(self):
+        return self._length
+    
+    def __iter__(self):
+        return (self[i] for i in range(self._length))
+    
+    def field(self, name, i):
+        """只取出第 i 筆的單一欄位"""
+        if name in self._texts:
+            offsets = self._offsets[name]
+            return self._texts[name][offsets[i]:offsets[i + 1]].decode("utf-8")
+        if name in self._dates:
+            ordinal = self._dates[name][i]
+            return Date.fromordinal(ordinal) if ordinal else None
+        return self._strings[self._coded[name][i]]
+    
+    def __getitem__(self, i) -> Scholarship:
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        values = {name: self.field(name, i) for name in self.TEXT_FIELDS + self.DATE_FIELDS}
+        values.update((name, self._strings[self._coded[name][i]]) for name in self.CODED_FIELDS)
+        return Scholarship(**values)
+    
+    @property
+    def nbytes(self):
+        """欄位資料佔用的位元組數 (不含字串表)"""
+        return sum(len(data) for data in self._texts.values()) + \
+            sum(column.itemsize * len(column)
+                for columns in (self._coded, self._offsets, self._dates) for column in columns.values())
+
+# 下一頁連結與分頁頁碼連結
+_NEXT_PAGE_XPATH = (
+    "//a[@rel='next' or contains(@class, 'next') or parent::li[contains(@class, 'next')]"
+    " or normalize-space(text())='下一頁' or normalize-space(text())='»' or normalize-space(text())='›']"
+)
+_PAGE_TWO_XPATH = "//*[contains(@class, 'pag')]//a[normalize-space(text())='2']"
+_PAGE_NUMBER_IN_URL = re.compile(r'(?<=[=/])2(?=$|[&/#?])')
+
+class CrawlCancelled(Exception):
+    """爬取已被取消或超過期限"""
+
+class Deadline:
+    """爬取的期限與取消旗標，由非同步 API 設定並傳遞到執行中的抓取"""
+    def __init__(self, timeout=None):
+        self.expires_at = time.monotonic() + timeout if timeout else None
+        self.cancelled = threading.Event()
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def remaining(self):
+        """剩餘秒數，沒有期限時回傳 None"""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+    
+    def check(self):
+        if self.cancelled.is_set():
+            raise CrawlCancelled("爬取已取消")
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise CrawlCancelled("爬取已超過期限")
+
+_current_deadline = contextvars.ContextVar("crawl_deadline", default=None)
+
+def check_deadline():
+    """目前的爬取已取消或過期時拋出 CrawlCancelled"""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+    return deadline
+
+def bounded_timeout(timeout):
+    """依目前的期限縮短逾時秒數"""
+    deadline = check_deadline()
+    remaining = deadline.remaining() if deadline is not None else None
+    return timeout if remaining is None else max(0.1, min(timeout, remaining))
+
+def wait_interruptibly(acquire, interval=0.2):
+    """反覆嘗試 acquire(timeout)，等待期間仍會檢查期限與取消"""
+    while not acquire(interval):
+        check_deadline()
+
+def sleep_interruptibly(seconds, interval=0.2):
+    """等待 seconds 秒，等待期間仍會檢查期限與取消"""
+    until = time.monotonic() + seconds
+    while True:
+        delay = until - time.monotonic()
+        if delay <= 0:
+            return
+        time.sleep(min(delay, interval))
+        check_deadline()
+
+class HostRateLimiter:
+    """限制每個主機的同時請求數與每秒請求數 (執行緒安全)"""
+    def __init__(self, max_concurrency=2, requests_per_second=2.0, overrides=None):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        # 主機 -> (max_concurrency, requests_per_second)
+        self.overrides = overrides or {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    def _state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                concurrency, rps = self.overrides.get(host, (self.max_concurrency, self.requests_per_second))
+                state = self._hosts[host] = {
+                    "slots": threading.BoundedSemaphore(concurrency),
+                    "interval": 1.0 / rps if rps else 0.0,
+                    "next_at": 0.0,
+                    "lock": threading.Lock()
+                }
+            return state
+    
+    @contextmanager
+    def slot(self, url):
+        """取得對該主機發出一個請求的許可"""
+        state = self._state(urlsplit(url).netloc)
+        wait_interruptibly(lambda timeout: state["slots"].acquire(timeout=timeout))
+        try:
+            with state["lock"]:
+                now = time.monotonic()
+                start_at = max(now, state["next_at"])
+                state["next_at"] = start_at + state["interval"]
+            sleep_interruptibly(start_at - time.monotonic())
+            yield
+        finally:
+            state["slots"].release()
+
+class CircuitOpenError(Exception):
+    """主機的斷路器開啟中，請求未送出"""
+
+class RetryPolicy:
+    """暫時性錯誤的重試策略：指數退避加上隨機抖動
+    
+    第 n 次重試前等待 base_delay * 2^(n-1) 秒 (最多 max_delay)，再乘上 1 ± jitter 的隨機倍數；
+    回應帶有 Retry-After 時至少等待該秒數。
+    """
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # WebDriverException 訊息中代表瀏覽器本身失效 (而非網站問題) 的片段
+    SESSION_ERRORS = ("invalid session id", "chrome not reachable", "disconnected", "session deleted",
+                      "target window already closed", "no such window")
+    
+    def __init__(self, attempts=3, base_delay=0.5, max_delay=8.0, jitter=0.5):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+    
+    def classify(self, error):
+        """錯誤的類型："host" 為網站或網路問題，"session" 為瀏覽器工作階段失效，其他為 None"""
+        if isinstance(error, CrawlCancelled):
+            return None
+        if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+            return "session"
+        if isinstance(error, TimeoutException):
+            return "host"
+        if isinstance(error, WebDriverException):
+            message = (error.msg or "").lower()
+            if any(fragment in message for fragment in self.SESSION_ERRORS):
+                return "session"
+            return "host" if "net::err_" in message else None
+        if requests is not None:
+            if isinstance(error, requests.HTTPError):
+                if error.response is not None and error.response.status_code in self.RETRY_STATUSES:
+                    return "host"
+                return None
+            if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+                return "host"
+        return None
+    
+    def is_retryable(self, error) -> bool:
+        """連線錯誤、逾時、瀏覽器的網路錯誤與 429/5xx 回應值得重試；其他錯誤與取消不重試"""
+        return self.classify(error) == "host"
+    
+    def delay(self, attempt, error=None) -> float:
+        """第 attempt 次失敗後、下一次重試前的等待秒數"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.max_delay))
+        return delay
+
+class CircuitBreaker:
+    """每個主機的斷路器 (執行緒安全)
+    
+    連續 failure_threshold 次請求失敗後開啟，reset_timeout 秒內對該主機的請求直接拋出
+    CircuitOpenError；之後進入半開狀態，只放行一個試探請求，成功即關閉，失敗則再次開啟。
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=120):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = {"failures": 0, "opened_at": None, "probing": False}
+        return state
+    
+    def before_request(self, host):
+        """允許送出請求時返回，否則拋出 CircuitOpenError"""
+        with self._lock:
+            state = self._state(host)
+            if state["opened_at"] is None:
+                return
+            remaining = state["opened_at"] + self.reset_timeout - time.monotonic()
+            if remaining > 0 or state["probing"]:
+                raise CircuitOpenError(f"{host} 的斷路器開啟中，{max(0, remaining):.0f} 秒後再試")
+            state["probing"] = True
+    
+    def record_success(self, host):
+        with self._lock:
+            self._hosts[host] = {"failures": 0, "opened_at": None, "probing": False}
+    
+    def record_failure(self, host) -> bool:
+        """記錄一次失敗，回傳斷路器是否因此開啟"""
+        with self._lock:
+            state = self._state(host)
+            state["failures"] += 1
+            if state["probing"] or (state["opened_at"] is None and state["failures"] >= self.failure_threshold):
+                state["opened_at"] = time.monotonic()
+                state["probing"] = False
+                return True
+            return False
+    
+    def release(self, host):
+        """請求未完成 (例如被取消) 時釋放試探請求的名額，不計成功或失敗"""
+        with self._lock:
+            self._state(host)["probing"] = False
+    
+    def is_open(self, host) -> bool:
+        with self._lock:
+            state = self._state(host)
+            return state["opened_at"] is not None and time.monotonic() - state["opened_at"] < self.reset_timeout
+    
+    def states(self) -> Dict[str, str]:
+        """各主機目前的狀態："closed"、"open" 或 "half_open"""
+        with self._lock:
+            hosts = list(self._hosts)
+        return {host: "open" if self.is_open(host) else
+                "closed" if self._hosts[host]["opened_at"] is None else "half_open" for host in hosts}
+
+class Metrics:
+    """執行緒安全的計時與計數收集器，flush 時將目前的數值輸出到各個 sink
+    
+    計時以 (名稱, 標籤) 累計次數、總秒數與單次最大值；一次觀察多個項目時 (count > 1)
+    最大值以平均計算。
+    """
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks or [])
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+    
+    @contextmanager
+    def timer(self, name, count=1, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, count, **labels)
+    
+    def observe(self, name, seconds, count=1, **labels):
+        if count <= 0:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = [0, 0.0, 0.0]
+            timing[0] += count
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds / count)
+    
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "timings": [
+                    {"name": name, "labels": dict(labels), "count": count, "sum": total, "max": longest}
+                    for (name, labels), (count, total, longest) in sorted(self._timings.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ]
+            }
+    
+    def flush(self):
+        """將目前的數值輸出到所有 sink"""
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.write(snapshot)
+    
+    def report(self) -> str:
+        """人類可讀的摘要，依總耗時排序"""
+        snapshot = self.snapshot()
+        lines = [f"{'項目':<40} {'次數':>8} {'總秒數':>10} {'平均毫秒':>10} {'最大毫秒':>10}"]
+        for timing in sorted(snapshot["timings"], key=lambda t: -t["sum"]):
+            label = timing["name"] + "".join(f" {k}={v}" for k, v in timing["labels"].items())
+            lines.append(f"{label:<40} {timing['count']:>8} {timing['sum']:>10.3f} "
+                         f"{timing['sum'] / timing['count'] * 1000:>10.2f} {timing['max'] * 1000:>10.2f}")
+        for counter in snapshot["counters"]:
+            label = counter["name"] + "".join(f" {k}={v}" for k, v in counter["labels"].items())
+            lines.append(f"{label:<40} {counter['value']:>8}")
+        return "\n".join(lines)
+
+class MemorySink:
+    """保留每次 flush 的內容，供測試或程式內檢查"""
+    def __init__(self):
+        self.snapshots = []
+    
+    def write(self, snapshot):
+        self.snapshots.append(snapshot)
+
+class JsonLogSink:
+    """每次 flush 附加一行 JSON 到記錄檔"""
+    def __init__(self, path):
+        self.path = path
+    
+    def write(self, snapshot):
+        record = {"time": datetime.now().isoformat(timespec="seconds"), **snapshot}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def _prometheus_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+def render_prometheus(snapshot, prefix="scholarship_") -> str:
+    """將 Metrics.snapshot() 轉為 Prometheus 文字格式"""
+    lines = []
+    typed = set()
+    for timing in snapshot["timings"]:
+        name = prefix + timing["name"]
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} summary")
+        labels = _prometheus_labels(timing["labels"])
+        lines.append(f"{name}_sum{labels} {timing['sum']:.6f}")
+        lines.append(f"{name}_count{labels} {timing['count']}")
+    for counter in snapshot["counters"]:
+        name = prefix + counter["name"]
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_prometheus_labels(counter['labels'])} {counter['value']}")
+    return "\n".join(lines) + "\n"
+
+class PrometheusTextSink:
+    """以 Prometheus 文字格式覆寫指標檔 (可供 node_exporter textfile collector 讀取)"""
+    def __init__(self, path, prefix="scholarship_"):
+        self.path = path
+        self.prefix = prefix
+    
+    def write(self, snapshot):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(render_prometheus(snapshot, self.prefix))
+        os.replace(temp_path, self.path)
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def get_chromedriver_path() -> str:
+    """取得 chromedriver 路徑 (每個行程只解析一次)"""
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        with _chromedriver_lock:
+            if _chromedriver_path is None:
+                _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
+class PooledDriver:
+    """包裝 WebDriver，記錄頁面載入次數"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.page_loads = 0
+        # 目前設定的封鎖網址樣式，None 表示尚未啟用 Network 網域
+        self.blocked_urls = None
+        # 工作階段已失效，歸還時直接關閉
+        self.broken = False
+    
+    def get(self, url):
+        self.page_loads += 1
+        return self.driver.get(url)
+    
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+class DriverPool:
+    """共用的 WebDriver 池，重複使用已啟動的瀏覽器"""
+    def __init__(self, factory, size=2, max_page_loads=50):
+        self.factory = factory
+        self.size = size
+        self.max_page_loads = max_page_loads
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+    
+    @contextmanager
+    def session(self):
+        """借出一個已重置的瀏覽器，使用完畢後歸還"""
+        wait_interruptibly(lambda timeout: self._slots.acquire(timeout=timeout))
+        driver = None
+        try:
+            driver = self._checkout()
+            yield driver
+        finally:
+            if driver is not None:
+                self._checkin(driver)
+            self._slots.release()
+    
+    def _checkout(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return PooledDriver(self.factory())
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+    
+    def _checkin(self, driver):
+        if self._closed or driver.broken or driver.page_loads >= self.max_page_loads or not self._reset(driver):
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+    
+    def _is_healthy(self, driver):
+        """確認瀏覽器仍可回應"""
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+    
+    def _reset(self, driver):
+        """清除 cookies 與多餘分頁，回到空白頁"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.driver.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
+    
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+    
+    def close(self):
+        """關閉所有閒置的瀏覽器"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "nav", "ol", "p", "pre", "section", "table", "tbody", "tfoot", "thead", "tr", "ul"
+}
+_CELL_TAGS = {"td", "th"}
+_SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+def _element_text(element):
+    """模擬瀏覽器 .text 的輸出：區塊元素換行，表格欄位以空白分隔"""
+    parts = []
+    
+    def walk(node):
+        tag = node.tag if isinstance(node.tag, str) else None
+        if tag in _SKIP_TAGS or tag is None:
+            return
+        separator = "\n" if tag in _BLOCK_TAGS else " " if tag in _CELL_TAGS else ""
+        parts.append(separator)
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        parts.append(separator)
+    
+    walk(element)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+_css_cache = {}
+
+def _find_all(node, by, value):
+    """在 lxml 節點上執行與 Selenium 相同語意的查詢"""
+    if by == By.CSS_SELECTOR:
+        selector = _css_cache.get(value)
+        if selector is None:
+            selector = _css_cache[value] = CSSSelector(value)
+        return selector(node)
+    if by == By.TAG_NAME:
+        return list(node.iterdescendants(value))
+    if by == By.XPATH:
+        return node.xpath(value)
+    raise ValueError(f"不支援的查詢方式: {by}")
+
+class HtmlElement:
+    """以 lxml 實作的元素，介面與 Selenium WebElement 相容"""
+    def __init__(self, node):
+        self.node = node
+        self._text = None
+    
+    @property
+    def tag_name(self):
+        return self.node.tag
+    
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = _element_text(self.node)
+        return self._text
+    
+    def get_attribute(self, name):
+        return self.node.get(name)
+    
+    def find_elements(self, by, value):
+        return [HtmlElement(node) for node in _find_all(self.node, by, value)]
+    
+    def find_element(self, by, value):
+        nodes = _find_all(self.node, by, value)
+        if not nodes:
+            raise NoSuchElementException(f"找不到元素: {value}")
+        return HtmlElement(nodes[0])
+
+class HtmlPage(HtmlElement):
+    """以 HTTP 取得並解析完成的頁面，介面與 WebDriver 的查詢方法相容"""
+    def __init__(self, url, content, encoding=None):
+        parser = lxml_html.HTMLParser(encoding=encoding) if encoding else None
+        document = lxml_html.fromstring(content, base_url=url, parser=parser)
+        document.make_links_absolute(url)
+        super().__init__(document)
+        self.current_url = url
+        self.page_source = content
+        self.etag = None
+        self.last_modified = None
+
+class HttpFetcher:
+    """使用 keep-alive 連線池抓取伺服器端渲染的頁面"""
+    def __init__(self, pool_size=4, timeout=15):
+        if requests is None or lxml_html is None:
+            raise RuntimeError("HTTP 抓取需要安裝 requests、lxml 與 cssselect")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def fetch(self, url, validators=None) -> HtmlPage:
+        """抓取頁面；帶入 ETag/Last-Modified 時若內容未變更回傳 None"""
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        
+        response = self.session.get(url, headers=headers, timeout=bounded_timeout(self.timeout))
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        
+        page = HtmlPage(response.url, response.content, self.encoding_of(response))
+        page.etag = response.headers.get("ETag")
+        page.last_modified = response.headers.get("Last-Modified")
+        return page
+    
+    def encoding_of(self, response):
+        """優先使用回應標頭的編碼；頁面也未宣告時視為 UTF-8"""
+        if "charset" in response.headers.get("Content-Type", "").lower():
+            return response.encoding
+        if b"charset" not in response.content[:4096].lower():
+            return "utf-8"
+        return None
+    
+    def close(self):
+        self.session.close()
+
+@dataclass
+class PageResult:
+    """單一列表頁的解析結果"""
+    items: List[Scholarship]
+    next_url: str = None
+    pattern: str = None
+
+@dataclass
+class CrawlRun:
+    """單一來源一次爬取的選項與結果狀態
+    
+    每次爬取各自一份，同時進行的爬取不會互相影響。page_cutoff 之前的頁面不再往後爬取，
+    連續遇到 known_keys 中的項目即停止；爬取結束後 stop_reason、error 與 stale
+    (有頁面改用過期快取) 記錄本次的結果。
+    """
+    page_cutoff: Date = None
+    known_keys: set = None
+    stop_reason: str = "max_pages"
+    error: Exception = None
+    stale: bool = False
+
+class PageCache:
+    """以 SQLite 保存各列表頁的解析結果，依 TTL 判斷是否需要重新抓取"""
+    def __init__(self, path="scholarship_cache.db", default_ttl=3600):
+        self.path = path
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY, source TEXT, fetched_at REAL,"
+                " etag TEXT, last_modified TEXT, content_hash TEXT,"
+                " items TEXT, next_url TEXT, pattern TEXT)"
+            )
+    
+    def get(self, url):
+        """回傳快取項目 (dict)，不存在時回傳 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, fetched_at, etag, last_modified, content_hash, items, next_url, pattern"
+                " FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        source, fetched_at, etag, last_modified, content_hash, items, next_url, pattern = row
+        return {
+            "source": source,
+            "fetched_at": fetched_at,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+            "result": PageResult([scholarship_from_record(item) for item in json.loads(items)], next_url, pattern)
         }
+    
+    def put(self, url, source, result: PageResult, etag=None, last_modified=None, content_hash=None):
+        items = json.dumps([scholarship_record(item) for item in result.items], ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, source, time.time(), etag, last_modified, content_hash,
+                 items, result.next_url, result.pattern)
+            )
+    
+    def touch(self, url):
+        """內容經驗證未變更，更新抓取時間"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+    
+    def clear(self, source=None):
+        with self._lock, self._conn:
+            if source is None:
+                self._conn.execute("DELETE FROM pages")
+            else:
+                self._conn.execute("DELETE FROM pages WHERE source = ?", (source,))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SeenStore:
+    """以 SQLite 保存已看過的獎學金項目，用於增量爬取與變更通知
+    
+    項目以 (來源, 鍵) 區分，同一則公告由多個來源刊登時各來源分別追蹤。
+    """
+    def __init__(self, path="scholarship_seen.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_items ("
+                " key TEXT, source TEXT, fingerprint TEXT, record TEXT,"
+                " first_seen REAL, last_seen REAL, removed INTEGER DEFAULT 0,"
+                " PRIMARY KEY (source, key))"
+            )
+    
+    def keys(self, source=None):
+        """目前仍存在的項目鍵"""
+        sql = "SELECT key FROM seen_items WHERE removed = 0"
+        params = ()
+        if source is not None:
+            sql += " AND source = ?"
+            params = (source,)
+        with self._lock:
+            return {row[0] for row in self._conn.execute(sql, params)}
+    
+    def apply(self, source, scholarships: List[Scholarship], stop_reason="max_pages") -> List[Dict[str, Any]]:
+        """比對本次爬取結果與已保存的項目，回傳新增、變更與移除的事件
+        
+        只有本次爬取範圍內的項目會被判定為移除：爬到列表結尾時為全部項目，
+        否則為日期晚於本次最後一個項目的項目 (同一天的項目可能在還沒爬取的下一頁)。
+        """
+        now = time.time()
+        detected_at = datetime.now().isoformat(timespec="seconds")
+        events = []
+        current = {}
+        for scholarship in scholarships:
+            current.setdefault(scholarship_key(scholarship), scholarship)
+        
+        with self._lock, self._conn:
+            stored = {
+                key: (fingerprint, record, removed)
+                for key, fingerprint, record, removed in self._conn.execute(
+                    "SELECT key, fingerprint, record, removed FROM seen_items WHERE source = ?", (source,))
+            }
+            
+            for key, scholarship in current.items():
+                fingerprint = scholarship_fingerprint(scholarship)
+                record = scholarship_record(scholarship)
+                previous = stored.get(key)
+                if previous is None or previous[2]:
+                    events.append(self._event("new", key, source, record, detected_at))
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO seen_items VALUES (?, ?, ?, ?, ?, ?, 0)",
+                        (key, source, fingerprint, json.dumps(record, ensure_ascii=False), now, now))
+                    continue
+                if previous[0] != fingerprint:
+                    events.append(self._event("changed", key, source, record, detected_at,
+                                              previous=json.loads(previous[1])))
+                self._conn.execute(
+                    "UPDATE seen_items SET fingerprint = ?, record = ?, last_seen = ? WHERE source = ? AND key = ?",
+                    (fingerprint, json.dumps(record, ensure_ascii=False), now, source, key))
+            
+            if stop_reason != "error":
+                boundary = None
+                for scholarship in reversed(scholarships):
+                    boundary = scholarship.published_on
+                    if boundary is not None:
+                        break
+                for key, (fingerprint, record, removed) in stored.items():
+                    if removed or key in current:
+                        continue
+                    record = json.loads(record)
+                    published = parse_date(record.get("date", ""))
+                    in_window = stop_reason == "end" or \
+                        (boundary is not None and published is not None and published > boundary)
+                    if in_window:
+                        events.append(self._event("removed", key, source, record, detected_at))
+                        self._conn.execute("UPDATE seen_items SET removed = 1, last_seen = ? WHERE source = ? AND key = ?",
+                                           (now, source, key))
+        
+        return events
+    
+    def _event(self, change, key, source, record, detected_at, previous=None):
+        event = {"type": change, "key": key, "source": source, "detected_at": detected_at, "scholarship": record}
+        if previous is not None:
+            event["previous"] = previous
+        return event
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SelectorMemory:
+    """以 SQLite 保存各來源上次找到列表的選擇器與項目數
+    
+    後續爬取先嘗試記住的選擇器，只有找不到項目或項目數變化過大時才重新逐一嘗試；
+    重新嘗試後選出的選擇器不同 (或完全找不到) 即記為一次漂移，代表網站版面可能已改變。
+    """
+    def __init__(self, path=":memory:", tolerance=0.5):
+        self.path = path
+        # 項目數與記住的數量相差超過此比例即重新嘗試
+        self.tolerance = tolerance
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS selectors ("
+                " source TEXT PRIMARY KEY, by TEXT, value TEXT, item_count INTEGER,"
+                " hits INTEGER DEFAULT 0, probes INTEGER DEFAULT 0, drifts INTEGER DEFAULT 0,"
+                " updated_at REAL, drifted_at REAL)"
+            )
+            self._remembered = {
+                source: ((by, value), item_count)
+                for source, by, value, item_count in self._conn.execute(
+                    "SELECT source, by, value, item_count FROM selectors WHERE by IS NOT NULL")
+            }
+    
+    def get(self, source):
+        """回傳 (query, item_count)，沒有記錄時回傳 None"""
+        return self._remembered.get(source)
+    
+    def similar(self, remembered_count, count):
+        """項目數是否仍在記住數量的容許範圍內"""
+        return abs(count - remembered_count) <= remembered_count * self.tolerance
+    
+    def hit(self, source, count):
+        """記住的選擇器仍然有效"""
+        with self._lock, self._conn:
+            query, _ = self._remembered[source]
+            self._remembered[source] = (query, count)
+            self._conn.execute(
+                "UPDATE selectors SET item_count = ?, hits = hits + 1, updated_at = ? WHERE source = ?",
+                (count, time.time(), source))
+    
+    def probed(self, source, query, count):
+        """記錄逐一嘗試後的結果；query 為 None 表示沒有找到任何項目"""
+        now = time.time()
+        with self._lock, self._conn:
+            previous = self._remembered.get(source)
+            drifted = previous is not None and previous[0] != query
+            if query is not None:
+                self._remembered[source] = (query, count)
+            else:
+                self._remembered.pop(source, None)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO selectors (source) VALUES (?)", (source,))
+            self._conn.execute(
+                "UPDATE selectors SET by = ?, value = ?, item_count = ?, probes = probes + 1,"
+                " drifts = drifts + ?, updated_at = ?, drifted_at = CASE WHEN ? THEN ? ELSE drifted_at END"
+                " WHERE source = ?",
+                (query[0] if query else None, query[1] if query else None, count,
+                 int(drifted), now, drifted, now, source))
+        if drifted:
+            print(f"{source} 的列表選擇器已改變: {previous[0][1]} -> {query[1] if query else '無'}")
+        return drifted
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """各來源的選擇器使用情形；drift_rate 為漂移次數佔頁面解析次數的比例"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, value, item_count, hits, probes, drifts, drifted_at FROM selectors").fetchall()
+        return {
+            source: {
+                "selector": value,
+                "item_count": item_count,
+                "hits": hits,
+                "probes": probes,
+                "drifts": drifts,
+                "drift_rate": drifts / (hits + probes) if hits + probes else 0.0,
+                "drifted_at": datetime.fromtimestamp(drifted_at).isoformat(timespec="seconds") if drifted_at else None
+            }
+            for source, value, item_count, hits, probes, drifts, drifted_at in rows
+        }
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class DetailCache:
+    """以 SQLite 保存詳細頁提取的欄位；項目指紋未變時不需重新抓取"""
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS details ("
+                " url TEXT PRIMARY KEY, fingerprint TEXT, fetched_at REAL, fields TEXT)"
+            )
+    
+    def get(self, url, fingerprint):
+        """回傳已保存的欄位 (dict)，不存在或項目已變更時回傳 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, fields FROM details WHERE url = ?", (url,)).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        return json.loads(row[1])
+    
+    def put(self, url, fingerprint, fields):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)",
+                (url, fingerprint, time.time(), json.dumps(fields, ensure_ascii=False)))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# 日期欄位可能使用的選擇器，依序嘗試
+DATE_SELECTORS = [
+    "span.date",
+    ".time",
+    "[class*='date']",
+    "td:last-child",  # 表格最後一欄通常是日期
+    "small"
+]
+
+_SNAPSHOT_SCRIPT = """
+const [by, value, dateSelectors] = arguments;
+let nodes;
+if (by === 'xpath') {
+    const result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+} else if (by === 'tag name') {
+    nodes = Array.from(document.getElementsByTagName(value));
+} else {
+    nodes = Array.from(document.querySelectorAll(value));
+}
+return nodes.map(el => {
+    const tag = el.tagName.toLowerCase();
+    const link = tag === 'a' ? el : el.querySelector('a');
+    return {
+        tag: tag,
+        text: el.innerText || '',
+        link_text: link && link !== el ? (link.innerText || '') : null,
+        href: link ? link.href : null,
+        date_texts: dateSelectors.map(s => {
+            const d = el.querySelector(s);
+            return d ? (d.innerText || '') : null;
+        })
+    };
+});
+"""
+
+@dataclass
+class ItemSnapshot:
+    """列表項目的純資料快照"""
+    tag: str
+    text: str
+    link_text: str = None
+    href: str = None
+    date_texts: List[str] = None
+
+class ScholarshipCrawler:
+    def __init__(self, pool_size=2, max_page_loads=50, backend="auto", extraction="snapshot",
+                 cache: PageCache = None, rate_limiter: HostRateLimiter = None,
+                 sources: Dict[str, SourceConfig] = None, selector_memory: SelectorMemory = None,
+                 detail_cache: DetailCache = None, metrics: Metrics = None,
+                 retry_policy: RetryPolicy = None, circuit_breaker: CircuitBreaker = None):
+        # 來源設定 (預設讀取 sources.json)；各來源的網址、就緒條件、分頁、快取與資源政策都在使用時
+        # 從這裡讀取，修改 self.sources[name] 即生效
+        self.sources = sources if sources is not None else load_sources()
         
         self.departments = {
             "資訊工程學系": "資工系",
@@ -74,6 +1600,229 @@ class ScholarshipCrawler:
             "化工系": "化工系",
             "土木系": "土木系"
         }
+        
+        self.driver_pool = DriverPool(self.setup_driver, size=pool_size, max_page_loads=max_page_loads)
+        
+        # 同時抓取的分頁數上限
+        self.page_workers = 3
+        
+        # 增量爬取時連續遇到這麼多個已知項目 (CrawlRun.known_keys) 即停止
+        self.known_run_length = 5
+        
+        # 列表頁快取 (來源未設定 cache_ttl 時使用 cache.default_ttl)
+        self.cache = cache
+        
+        # 精簡瀏覽模式：依各來源的資源政策封鎖圖片、字型等資源，並在 DOM 建立後即開始等待就緒條件
+        self.lean_browser = True
+        self.page_load_strategy = "eager"
+        
+        # backend: "auto" 依來源決定, "http" 或 "selenium" 強制使用指定方式
+        self.backend = backend
+        self._http = None
+        self._http_lock = threading.Lock()
+        
+        # extraction: "snapshot" 一次取回整個列表, "page_source" 取回整頁 HTML 在本機解析,
+        # "element" 逐一查詢每個元素 (僅影響 Selenium 頁面)
+        self.extraction = extraction
+        
+        # 每個主機的同時請求數與每秒請求數限制，Selenium 載入頁面的逾時秒數
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.page_load_timeout = 30
+        
+        # 頁面載入的重試策略與各主機的斷路器
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        
+        # 非同步 API 用來執行同步爬取的執行緒池
+        self._executor = None
+        
+        # 各來源上次找到列表的選擇器
+        self.selector_memory = selector_memory or SelectorMemory()
+        
+        # 詳細頁欄位快取，以及同時抓取的詳細頁數上限
+        self.detail_cache = detail_cache or DetailCache()
+        self.detail_workers = 4
+        
+        # 各階段的耗時與解析失敗次數
+        self.metrics = metrics or Metrics()
+    
+    def close(self):
+        """釋放瀏覽器與連線資源"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.driver_pool.close()
+        if self._http is not None:
+            self._http.close()
+        if self.cache is not None:
+            self.cache.close()
+        self.selector_memory.close()
+        self.detail_cache.close()
+        self.metrics.flush()
+    
+    @property
+    def crawlers(self):
+        """各來源名稱對應的爬取方法"""
+        return {name: partial(self.crawl_source, name) for name in self.sources}
+    
+    async def run_async(self, func, *args, timeout=None):
+        """在執行緒池中執行同步的爬取函式
+        
+        timeout 與外部取消都會設定 Deadline，執行中的抓取會在下一次等待或請求時停止。
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="crawl")
+        deadline = Deadline(timeout)
+        
+        def run():
+            _current_deadline.set(deadline)
+            return func(*args)
+        
+        future = asyncio.get_running_loop().run_in_executor(self._executor, contextvars.copy_context().run, run)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            deadline.cancel()
+            raise
+    
+    async def crawl_source_async(self, source_name, max_pages=3, timeout=None) -> List[Scholarship]:
+        """非同步爬取單一來源"""
+        return await self.run_async(self.crawlers[source_name], max_pages, timeout=timeout)
+    
+    def backend_for(self, source_name):
+        """決定來源使用的抓取方式"""
+        if self.backend != "auto":
+            return self.backend
+        # 需要執行 JavaScript 才能取得列表的來源設定為 selenium
+        if self.sources[source_name].backend == "selenium" or requests is None or lxml_html is None:
+            return "selenium"
+        return "http"
+    
+    @property
+    def http(self) -> HttpFetcher:
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = HttpFetcher(pool_size=max(4, self.driver_pool.size))
+        return self._http
+    
+    @contextmanager
+    def open_page(self, source_name, url, validators=None, ready: ReadyCondition = None):
+        """載入頁面並回傳可查詢元素的物件 (WebDriver 或 HtmlPage)
+        
+        HTTP 抓取時若帶入的 validators 驗證內容未變更，回傳 None。
+        ready 未指定時使用來源列表頁的就緒條件。
+        """
+        if self.backend_for(source_name) == "http":
+            def fetch():
+                with self.rate_limiter.slot(url):
+                    with self.metrics.timer("page_load_seconds", source=source_name, backend="http"):
+                        page = self.http.fetch(url, validators)
+                if page is not None:
+                    self.metrics.increment("page_bytes_total", len(page.page_source), source=source_name, backend="http")
+                return page
+            
+            yield self.fetch_with_retry(source_name, url, fetch)
+            return
+        
+        # 瀏覽器工作階段失效時關閉該瀏覽器，換一個重新載入一次
+        for attempt in range(2):
+            with self.driver_pool.session() as driver:
+                def load():
+                    self.apply_resource_policy(driver, source_name)
+                    with self.rate_limiter.slot(url):
+                        driver.set_page_load_timeout(bounded_timeout(self.page_load_timeout))
+                        with self.metrics.timer("page_load_seconds", source=source_name, backend="selenium"):
+                            driver.get(url)
+                        self.metrics.observe("page_ready_seconds",
+                                             self.wait_until_ready(driver, source_name, ready), source=source_name)
+                    self.metrics.increment("page_bytes_total", driver.execute_script(_TRANSFER_SIZE_SCRIPT) or 0,
+                                           source=source_name, backend="selenium")
+                
+                try:
+                    self.fetch_with_retry(source_name, url, load)
+                except WebDriverException as e:
+                    if self.retry_policy.classify(e) != "session":
+                        raise
+                    driver.broken = True
+                    if attempt:
+                        raise
+                    print(f"瀏覽器工作階段失效 ({type(e).__name__})，改用新的瀏覽器重新載入")
+                    continue
+                yield driver
+                return
+    
+    def apply_resource_policy(self, driver, source_name):
+        """依來源的資源政策設定瀏覽器封鎖的網址，與目前設定相同時不重送"""
+        patterns = self.sources[source_name].resources.blocked_urls() if self.lean_browser else []
+        if driver.blocked_urls == patterns:
+            return
+        if driver.blocked_urls is None:
+            if not patterns:
+                return
+            driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver.blocked_urls = patterns
+    
+    def fetch_with_retry(self, source_name, url, fetch):
+        """執行 fetch()，暫時性錯誤依 retry_policy 重試
+        
+        主機的斷路器開啟時不送出請求，直接拋出 CircuitOpenError；
+        重試期間斷路器開啟則放棄剩餘的重試。只有網站或網路問題計入斷路器的失敗次數，
+        瀏覽器工作階段失效或選擇器錯誤等本機問題不重試也不計入。
+        """
+        host = urlsplit(url).netloc
+        attempts = self.retry_policy.attempts
+        for attempt in range(1, attempts + 1):
+            self.circuit_breaker.before_request(host)
+            try:
+                result = fetch()
+            except Exception as e:
+                if not self.retry_policy.is_retryable(e):
+                    if getattr(e, "response", None) is not None:
+                        # 主機有回應 (例如 404)，不算主機故障
+                        self.circuit_breaker.record_success(host)
+                    else:
+                        self.circuit_breaker.release(host)
+                    raise
+                if self.circuit_breaker.record_failure(host):
+                    self.metrics.increment("circuit_open_total", host=host)
+                    print(f"{host} 連續失敗，{self.circuit_breaker.reset_timeout} 秒內暫停對其發出請求")
+                if attempt == attempts or self.circuit_breaker.is_open(host):
+                    raise
+                delay = self.retry_policy.delay(attempt, e)
+                self.metrics.increment("fetch_retries_total", source=source_name, reason=type(e).__name__)
+                print(f"載入 {url} 失敗 ({type(e).__name__})，{delay:.1f} 秒後重試 ({attempt}/{attempts - 1})")
+                sleep_interruptibly(delay)
+            else:
+                self.circuit_breaker.record_success(host)
+                return result
+    
+    def wait_until_ready(self, driver, source_name, condition: ReadyCondition = None) -> float:
+        """以短間隔輪詢就緒條件，逾時則使用目前已載入的內容"""
+        if condition is None:
+            condition = self.sources[source_name].ready
+        
+        def is_ready(d):
+            if d.execute_script("return document.readyState") == "loading":
+                return False
+            if condition.selector and \
+               len(d.find_elements(By.CSS_SELECTOR, condition.selector)) < condition.min_count:
+                return False
+            if condition.network_idle and \
+               d.execute_script(_NETWORK_IDLE_SCRIPT) < condition.idle_time * 1000:
+                return False
+            return True
+        
+        start = time.monotonic()
+        try:
+            timeout = bounded_timeout(condition.timeout)
+            WebDriverWait(driver, timeout, poll_frequency=condition.poll_interval).until(is_ready)
+            elapsed = time.monotonic() - start
+            print(f"{source_name} 頁面就緒，耗時 {elapsed:.2f} 秒")
+        except TimeoutException:
+            elapsed = time.monotonic() - start
+            print(f"{source_name} 頁面在 {condition.timeout} 秒內未達就緒條件，使用目前內容")
+        return elapsed
     
     def setup_driver(self):
         """設置 Chrome WebDriver"""
@@ -85,169 +1834,322 @@ class ScholarshipCrawler:
         options.add_argument("--ignore-certificate-errors")
         options.add_argument("--ignore-ssl-errors")
         options.add_argument("--disable-web-security")
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        options.add_argument(f"--user-agent={USER_AGENT}")
+        options.page_load_strategy = self.page_load_strategy
         
-        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
-    def crawl_student_affairs(self, max_pages=3) -> List[Scholarship]:
-        """爬取生輔組獎學金 """
-        scholarships = []
-        driver = self.setup_driver()
+        if self.lean_browser:
+            options.add_argument("--mute-audio")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-component-update")
+            options.add_argument("--no-first-run")
+            prefs = {
+                "profile.default_content_setting_values.notifications": 2,
+                "profile.default_content_setting_values.geolocation": 2
+            }
+            # 瀏覽器由所有來源共用，只有全部來源都封鎖圖片時才整個停用
+            if all("image" in source.resources.block and "image" not in source.resources.allow
+                   for source in self.sources.values()):
+                prefs["profile.managed_default_content_settings.images"] = 2
+            options.add_experimental_option("prefs", prefs)
         
-        try:
-            url = self.target_urls["生輔組"]
-            print(f"正在爬取生輔組: {url}")
-            driver.get(url)
-            time.sleep(5)  # 增加等待時間
-            
-            # 等待頁面加載
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # 嘗試多種選擇器來找獎學金項目
-            selectors = [
-                "div.scholarship-list .item",
-                "div.list-group .list-group-item",
-                "table.table tbody tr",
-                "div.row .col-md-12",
-                "div[class*='scholarship']",
-                ".news-item",
-                "li.list-group-item",
-                "div.panel div.panel-body"
-            ]
-            
-            items = []
-            for selector in selectors:
-                try:
-                    items = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if len(items) > 0:
-                        print(f"找到 {len(items)} 個項目 (使用選擇器: {selector})")
-                        break
-                except Exception as e:
-                    continue
-            
-            # 如果還是沒找到，嘗試更通用的方法
-            if not items:
-                items = driver.find_elements(By.XPATH, "//a[contains(text(), '獎學金') or contains(text(), '獎助')]")
-            
-            for item in items:
-                scholarship = self.parse_scholarship_item(item, "生輔組", driver)
-                if scholarship:
-                    scholarships.append(scholarship)
-                    
-        except Exception as e:
-            print(f"爬取生輔組時出錯: {e}")
-        finally:
-            driver.quit()
-            
-        return scholarships
+        with self.metrics.timer("driver_startup_seconds"):
+            return webdriver.Chrome(service=Service(get_chromedriver_path()), options=options)
+    
+    def crawl_source(self, source_name, max_pages=3, run: CrawlRun = None) -> List[Scholarship]:
+        """依來源設定爬取獎學金列表，run 帶入本次的選項並記錄結果狀態"""
+        source = self.sources[source_name]
+        return self.crawl_paginated(source_name, partial(self.parse_list_page, source), max_pages, run)
+    
+    def parse_list_page(self, source: SourceConfig, page, first_page=True) -> List[Scholarship]:
+        """以來源的候選選擇器找出列表項目並解析
+        
+        先嘗試上次找到列表的選擇器，項目數不足或變化過大時才逐一嘗試所有候選選擇器。
+        記住的選擇器與項目數只依第 1 頁更新；之後的分頁 (first_page=False) 可能較短且同時解析，
+        只要記住的選擇器找得到項目就直接使用，重新嘗試的結果也不寫回。
+        """
+        start = time.perf_counter()
+        remembered = self.selector_memory.get(source.name)
+        if remembered is not None:
+            query, remembered_count = remembered
+            try:
+                items = page.find_elements(*query)
+            except WebDriverException:
+                items = []
+            if not first_page and items:
+                self.metrics.observe("selector_probe_seconds", time.perf_counter() - start,
+                                     source=source.name, result="remembered")
+                return self.parse_items(page, items, query, source.name)
+            if len(items) >= source.min_items and self.selector_memory.similar(remembered_count, len(items)):
+                self.selector_memory.hit(source.name, len(items))
+                self.metrics.observe("selector_probe_seconds", time.perf_counter() - start,
+                                     source=source.name, result="remembered")
+                return self.parse_items(page, items, query, source.name)
+        
+        items, query = self.probe_selectors(source, page)
+        if first_page and self.selector_memory.probed(source.name, query if items else None, len(items)):
+            self.metrics.increment("selector_drift_total", source=source.name)
+        self.metrics.observe("selector_probe_seconds", time.perf_counter() - start,
+                             source=source.name, result="probe")
+        return self.parse_items(page, items, query, source.name)
+    
+    def probe_selectors(self, source: SourceConfig, page):
+        """依序嘗試候選選擇器，回傳 (items, query)"""
+        items = []
+        query = None
+        for selector in source.selectors:
+            try:
+                query = (By.CSS_SELECTOR, selector)
+                items = page.find_elements(*query)
+                if len(items) >= source.min_items:
+                    print(f"找到 {len(items)} 個項目 (使用選擇器: {selector})")
+                    break
+            except Exception as e:
+                continue
+        
+        # 如果還是沒找到，使用較通用的查詢
+        if not items and source.fallback:
+            query = source.fallback
+            items = page.find_elements(*query)
+        
+        return items, query
+    
+    def crawl_student_affairs(self, max_pages=3) -> List[Scholarship]:
+        """爬取生輔組獎學金 """
+        return self.crawl_source("生輔組", max_pages)
     
     def crawl_csie(self, max_pages=3) -> List[Scholarship]:
         """爬取資工系 """
-        scholarships = []
-        driver = self.setup_driver()
+        return self.crawl_source("資工系", max_pages)
+    
+    def crawl_overseas_affairs(self, max_pages=3) -> List[Scholarship]:
+        """爬取僑陸組 """
+        return self.crawl_source("僑陸組", max_pages)
+    
+    def crawl_paginated(self, source_name, parse_page, max_pages=3, run: CrawlRun = None) -> List[Scholarship]:
+        """爬取來源的前 max_pages 頁
         
+        能推得頁碼網址格式時第 2..N 頁同時抓取，否則沿著下一頁連結逐頁抓取；
+        第 2 頁起以 parse_page(page, first_page=False) 解析。
+        遇到整頁都已出現過或都早於 run.page_cutoff 的頁面，或連續 known_run_length 個
+        已知項目 (run.known_keys) 時即停止；停止原因與錯誤記錄在 run。
+        """
+        run = run if run is not None else CrawlRun()
+        scholarships = []
+        state = {"seen": set(), "known_run": 0, "run": run}
+        run.stop_reason = "max_pages"
         try:
-            url = self.target_urls["資工系"]
-            print(f"正在爬取資工系: {url}")
-            driver.get(url)
-            time.sleep(5)
+            url = self.sources[source_name].url
+            print(f"正在爬取{source_name}: {url}")
+            first = self.load_page(source_name, url, parse_page, run)
+            reason = self._accept_page(first.items, state, scholarships)
+            if reason or max_pages <= 1:
+                run.stop_reason = reason or "max_pages"
+                return scholarships
             
-            # 等待頁面加載
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # 資工系可能的選擇器
-            selectors = [
-                "div.announcement-list .item",
-                "table.table tbody tr",
-                "div.news-list .news-item",
-                "ul.list-group li",
-                "div[class*='announcement']",
-                "div[class*='news']",
-                ".content-list .item",
-                "tr"
-            ]
-            
-            items = []
-            for selector in selectors:
-                try:
-                    items = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if len(items) > 1:  # 至少要有2個以上才算找到列表
-                        print(f"找到 {len(items)} 個項目 (使用選擇器: {selector})")
+            parse_page = partial(parse_page, first_page=False)
+            pattern = self.sources[source_name].page_url_pattern or first.pattern
+            if pattern:
+                urls = [pattern.format(page=n) for n in range(2, max_pages + 1)]
+                for result in self._fetch_pages(source_name, urls, parse_page, run):
+                    reason = "error" if result is None else self._accept_page(result.items, state, scholarships)
+                    if reason:
                         break
-                except Exception as e:
-                    continue
-            
-            # 如果還是沒找到，嘗試找所有連結
-            if not items:
-                items = driver.find_elements(By.TAG_NAME, "a")
-            
-            for item in items:
-                scholarship = self.parse_scholarship_item(item, "資工系", driver)
-                if scholarship:
-                    scholarships.append(scholarship)
+            else:
+                next_url = first.next_url
+                for _ in range(max_pages - 1):
+                    if not next_url:
+                        reason = "end"
+                        break
+                    result = self.load_page(source_name, next_url, parse_page, run)
+                    next_url = result.next_url
+                    reason = self._accept_page(result.items, state, scholarships)
+                    if reason:
+                        break
+            run.stop_reason = reason or "max_pages"
                     
         except Exception as e:
-            print(f"爬取資工系時出錯: {e}")
-        finally:
-            driver.quit()
+            print(f"爬取{source_name}時出錯: {e}")
+            run.error = e
+            run.stop_reason = "error"
             
         return scholarships
     
-    def crawl_overseas_affairs(self, max_pages=3) -> List[Scholarship]:
-        """爬取僑陸組 """
-        scholarships = []
-        driver = self.setup_driver()
+    def load_page(self, source_name, url, parse_page, run: CrawlRun = None) -> PageResult:
+        """取得單一列表頁的解析結果
+        
+        快取未過期時直接回傳；過期時以 ETag/Last-Modified 或內容雜湊驗證，
+        內容未變更就沿用快取的解析結果。重試後仍無法載入或解析時，改用上次成功的快取結果
+        並將 run.stale 設為 True。
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None:
+            ttl = self.sources[source_name].cache_ttl
+            ttl = self.cache.default_ttl if ttl is None else ttl
+            if time.time() - entry["fetched_at"] < ttl:
+                return entry["result"]
         
         try:
-            url = self.target_urls["僑陸組"]
-            print(f"正在爬取僑陸組: {url}")
-            driver.get(url)
-            time.sleep(5)
-            
-            # 等待頁面加載
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # 僑陸組可能的選擇器
-            selectors = [
-                "div.content-list .item",
-                "table tbody tr",
-                "ul li",
-                "div[class*='list'] .item",
-                ".news-list .news-item",
-                "div.row div[class*='col']",
-                "a[href*='scholarship']",
-                "tr"
-            ]
+            return self._load_fresh_page(source_name, url, parse_page, entry)
+        except CrawlCancelled:
+            raise
+        except Exception as e:
+            if entry is None:
+                raise
+            age = time.time() - entry["fetched_at"]
+            print(f"{source_name} 無法載入 {url} ({e})，改用 {age / 60:.0f} 分鐘前的快取結果")
+            self.metrics.increment("stale_pages_total", source=source_name)
+            if run is not None:
+                run.stale = True
+            return entry["result"]
+    
+    def _load_fresh_page(self, source_name, url, parse_page, entry) -> PageResult:
+        """實際載入並解析列表頁，更新快取"""
+        with self.open_page(source_name, url, entry) as page:
+            if page is None:
+                self.cache.touch(url)
+                return entry["result"]
             
-            items = []
-            for selector in selectors:
-                try:
-                    items = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if len(items) > 0:
-                        print(f"找到 {len(items)} 個項目 (使用選擇器: {selector})")
-                        break
-                except Exception as e:
-                    continue
+            content_hash = None
+            if self.cache is not None:
+                source = page.page_source
+                content_hash = hashlib.sha1(source if isinstance(source, bytes) else source.encode("utf-8")).hexdigest()
+                if entry is not None and entry["content_hash"] == content_hash:
+                    self.cache.touch(url)
+                    return entry["result"]
             
-            for item in items:
-                scholarship = self.parse_scholarship_item(item, "僑陸組", driver)
-                if scholarship:
-                    scholarships.append(scholarship)
-                    
-        except Exception as e:
-            print(f"爬取僑陸組時出錯: {e}")
-        finally:
-            driver.quit()
+            result = PageResult(parse_page(page), *self.find_pagination(page))
+            etag = getattr(page, "etag", None)
+            last_modified = getattr(page, "last_modified", None)
+        
+        if self.cache is not None:
+            self.cache.put(url, source_name, result, etag, last_modified, content_hash)
+        return result
+    
+    def _fetch_pages(self, source_name, urls, parse_page, run: CrawlRun = None):
+        """同時抓取多個分頁，依頁碼順序回傳 PageResult，失敗的頁面為 None"""
+        def fetch(url):
+            try:
+                return self.load_page(source_name, url, parse_page, run)
+            except Exception as e:
+                print(f"爬取{source_name}分頁 {url} 時出錯: {e}")
+                return None
+        
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.page_workers, len(urls)), thread_name_prefix="page") as executor:
+            # 每個分頁各自複製 context，讓期限與取消旗標傳到分頁執行緒
+            futures = [executor.submit(contextvars.copy_context().run, fetch, url) for url in urls]
+            return [future.result() for future in futures]
+    
+    def _accept_page(self, page_items, state, scholarships):
+        """加入新項目，回傳停止原因；應繼續爬取下一頁時回傳 None"""
+        new_items = [s for s in page_items if scholarship_key(s) not in state["seen"]]
+        if page_items and not new_items:
+            return "seen"
+        
+        run = state["run"]
+        known_run_reached = False
+        for scholarship in new_items:
+            key = scholarship_key(scholarship)
+            state["seen"].add(key)
+            scholarships.append(scholarship)
+            if run.known_keys is not None:
+                state["known_run"] = state["known_run"] + 1 if key in run.known_keys else 0
+                known_run_reached = known_run_reached or state["known_run"] >= self.known_run_length
+        
+        if known_run_reached:
+            return "known"
+        if run.page_cutoff and new_items:
+            dates = [s.published_on for s in new_items]
+            if all(d is not None and d < run.page_cutoff for d in dates):
+                return "cutoff"
+        return None
+    
+    def find_pagination(self, page):
+        """找出下一頁連結，以及由第 2 頁連結推得的頁碼網址格式"""
+        next_url = None
+        pattern = None
+        try:
+            links = page.find_elements(By.XPATH, _NEXT_PAGE_XPATH)
+            if links:
+                next_url = links[0].get_attribute("href")
             
+            page_two = page.find_elements(By.XPATH, _PAGE_TWO_XPATH)
+            if page_two:
+                href = page_two[0].get_attribute("href") or ""
+                matches = list(_PAGE_NUMBER_IN_URL.finditer(href))
+                if matches:
+                    start, end = matches[-1].span()
+                    pattern = href[:start].replace("{", "{{").replace("}", "}}") + "{page}" + \
+                        href[end:].replace("{", "{{").replace("}", "}}")
+        except WebDriverException:
+            pass
+        
+        if next_url and next_url.startswith("javascript"):
+            next_url = None
+        return next_url, pattern
+    
+    def parse_items(self, page, items, query, source_name) -> List[Scholarship]:
+        """解析查詢到的項目
+        
+        瀏覽器頁面在 snapshot 模式下以一次 execute_script 取回所有欄位，
+        page_source 模式下取回整頁 HTML 以 lxml 解析，之後都不需再與瀏覽器溝通。
+        """
+        start = time.perf_counter()
+        parsed = None
+        if not isinstance(page, HtmlElement) and self.extraction != "element":
+            try:
+                if self.extraction == "page_source":
+                    local_page = HtmlPage(page.current_url, page.page_source)
+                    items = local_page.find_elements(*query)
+                    parsed = (self.parse_scholarship_item(item, source_name, local_page) for item in items)
+                else:
+                    snapshots = self.snapshot_items(page, *query)
+                    parsed = (self.parse_item_snapshot(snapshot, source_name) for snapshot in snapshots)
+            except WebDriverException as e:
+                print(f"{source_name} 無法一次取得列表快照，改為逐一解析: {e}")
+        if parsed is None:
+            parsed = (self.parse_scholarship_item(item, source_name, page) for item in items)
+        scholarships = [scholarship for scholarship in parsed if scholarship]
+        self.metrics.observe("item_parse_seconds", time.perf_counter() - start, count=len(items), source=source_name)
         return scholarships
     
-    def parse_scholarship_item(self, item, source_name, driver):
+    def snapshot_items(self, driver, by, value) -> List["ItemSnapshot"]:
+        """以一次 execute_script 取得所有項目的標籤、文字、連結與日期欄位"""
+        rows = driver.execute_script(_SNAPSHOT_SCRIPT, by, value, DATE_SELECTORS)
+        return [ItemSnapshot(**row) for row in rows]
+    
+    def parse_item_snapshot(self, snapshot: "ItemSnapshot", source_name) -> Scholarship:
+        """從快照解析單個獎學金項目，不需再與瀏覽器溝通"""
+        if snapshot.tag == 'a':
+            title = snapshot.text.strip()
+            href = snapshot.href
+        elif snapshot.link_text is not None:
+            title = snapshot.link_text.strip()
+            href = snapshot.href
+        else:
+            title = snapshot.text.strip()
+            href = ""
+        
+        if not self.accept_title(title, source_name):
+            return None
+        
+        date = ""
+        for date_text in snapshot.date_texts:
+            if date_text and self.is_date_format(date_text.strip()):
+                date = date_text.strip()
+                break
+        else:
+            date = self.extract_date_from_text(snapshot.text)
+        
+        return self.build_scholarship(
+            title, href, source_name, date,
+            self.extract_status(snapshot.text),
+            self.extract_category(snapshot.text)
+        )
+    
+    def parse_scholarship_item(self, item, source_name, page):
         """解析單個獎學金項目"""
         try:
             # 嘗試找到連結和標題
@@ -272,55 +2174,103 @@ class ScholarshipCrawler:
                     href = ""
             
             # 檢查是否為獎學金相關
-            if not title or not self.is_scholarship_related(title):
+            if not self.accept_title(title, source_name):
                 return None
             
-            # 處理相對連結
-            if href and not href.startswith("http"):
-                if source_name == "生輔組":
-                    base_url = "https://advisory.ntu.edu.tw"
-                elif source_name == "資工系":
-                    base_url = "https://www.csie.ntu.edu.tw"
-                elif source_name == "僑陸組":
-                    base_url = "https://gocfs.ntu.edu.tw"
-                else:
-                    base_url = ""
-                
-                if base_url:
-                    href = base_url + ("" if href.startswith("/") else "/") + href
-            
             # 提取其他信息
             date = self.extract_date_from_element(item)
             status = self.extract_status_from_element(item)
             category = self.extract_category_from_element(item)
             
-            scholarship = Scholarship(
-                title=title,
-                url=href or "",
-                source=source_name,
-                date=date,
-                status=status,
-                category=category
-            )
-            
-            return scholarship
+            return self.build_scholarship(title, href, source_name, date, status, category)
             
         except Exception as e:
+            self.metrics.increment("parse_failures_total", source=source_name, reason=type(e).__name__)
             return None
     
+    def accept_title(self, title, source_name) -> bool:
+        """標題是否為獎學金項目，略過的項目依原因計數"""
+        if not title:
+            self.metrics.increment("items_skipped_total", source=source_name, reason="empty_title")
+            return False
+        if not self.is_scholarship_related(title):
+            self.metrics.increment("items_skipped_total", source=source_name, reason="not_related")
+            return False
+        return True
+    
+    def build_scholarship(self, title, href, source_name, date, status, category) -> Scholarship:
+        """補全相對連結並建立 Scholarship"""
+        # 處理相對連結
+        if href and not href.startswith("http"):
+            source = self.sources.get(source_name)
+            base_url = source.base_url if source is not None else ""
+            if base_url:
+                href = base_url + ("" if href.startswith("/") else "/") + href
+        
+        return Scholarship(
+            title=title,
+            url=href or "",
+            source=source_name,
+            date=date,
+            status=status,
+            category=category,
+            published_on=parse_date(date)
+        )
+    
+    def enrich(self, scholarships: List[Scholarship], workers=None) -> List[Scholarship]:
+        """抓取各項目的詳細頁，補上 description、deadline、amount 與 contact
+        
+        已抓取過且項目指紋未變的詳細頁直接使用快取；抓取失敗的項目保持原樣。
+        """
+        pending = {}
+        fields = {}
+        for scholarship in scholarships:
+            if not scholarship.url.startswith("http"):
+                continue
+            fingerprint = scholarship_fingerprint(scholarship)
+            cached = self.detail_cache.get(scholarship.url, fingerprint)
+            if cached is not None:
+                fields[scholarship.url] = cached
+            else:
+                pending.setdefault(scholarship.url, (scholarship.source, fingerprint))
+        
+        def fetch(url):
+            source_name, fingerprint = pending[url]
+            try:
+                with self.metrics.timer("detail_fetch_seconds", source=source_name):
+                    details = self.fetch_details(source_name, url)
+            except Exception as e:
+                print(f"抓取詳細頁 {url} 時出錯: {e}")
+                self.metrics.increment("detail_failures_total", source=source_name, reason=type(e).__name__)
+                return
+            self.detail_cache.put(url, fingerprint, details)
+            fields[url] = details
+        
+        if pending:
+            print(f"抓取 {len(pending)} 個詳細頁 (快取 {len(fields)} 個)")
+            workers = min(workers or self.detail_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detail") as executor:
+                futures = [executor.submit(contextvars.copy_context().run, fetch, url) for url in pending]
+                for future in futures:
+                    future.result()
+        
+        return [replace(s, **fields[s.url], deadline_on=parse_date(fields[s.url]["deadline"])) if s.url in fields else s
+                for s in scholarships]
+    
+    def fetch_details(self, source_name, url) -> Dict[str, str]:
+        """抓取單一詳細頁並提取欄位"""
+        with self.open_page(source_name, url, ready=ReadyCondition()) as page:
+            for selector in CONTENT_SELECTORS:
+                elements = page.find_elements(By.CSS_SELECTOR, selector)
+                if elements and elements[0].text.strip():
+                    return extract_details(elements[0].text)
+        return extract_details("")
+    
     def extract_date_from_element(self, element):
         """從元素中提取日期"""
         try:
             # 先嘗試找特定的日期元素
-            date_selectors = [
-                "span.date",
-                ".time",
-                "[class*='date']",
-                "td:last-child",  # 表格最後一欄通常是日期
-                "small"
-            ]
-            
-            for selector in date_selectors:
+            for selector in DATE_SELECTORS:
                 try:
                     date_elem = element.find_element(By.CSS_SELECTOR, selector)
                     date_text = date_elem.text.strip()
@@ -330,94 +2280,58 @@ class ScholarshipCrawler:
                     continue
             
             # 如果沒找到，嘗試從文本中提取
-            text = element.text
-            date_patterns = [
-                r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})',
-                r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})',
-                r'(\d{4}年\d{1,2}月\d{1,2}日)',
-                r'(\d{4}\.\d{1,2}\.\d{1,2})'
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, text)
-                if match:
-                    return match.group(1)
+            return self.extract_date_from_text(element.text)
                     
-        except:
-            pass
+        except Exception as e:
+            self.metrics.increment("field_failures_total", field="date", reason=type(e).__name__)
+        
+        return ""
+    
+    def extract_date_from_text(self, text):
+        """從文字中提取日期"""
+        for pattern in DATE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1)
         
         return ""
     
     def is_date_format(self, text):
         """檢查文字是否為日期格式"""
-        date_patterns = [
-            r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',
-            r'\d{1,2}[-/]\d{1,2}[-/]\d{4}',
-            r'\d{4}年\d{1,2}月\d{1,2}日',
-            r'\d{4}\.\d{1,2}\.\d{1,2}'
-        ]
-        
-        for pattern in date_patterns:
-            if re.search(pattern, text):
-                return True
-        return False
+        return ANY_DATE_PATTERN.search(text) is not None
     
     def extract_status_from_element(self, element):
         """從元素中提取狀態"""
         try:
-            text = element.text.lower()
-            status_keywords = {
-                '開放申請': ['開放', '申請中', '受理中'],
-                '截止': ['截止', '結束', 'closed'],
-                '審核中': ['審核', '評選'],
-                '即將截止': ['即將', 'deadline']
-            }
-            
-            for status, keywords in status_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    return status
-        except:
-            pass
+            return self.extract_status(element.text)
+        except Exception as e:
+            self.metrics.increment("field_failures_total", field="status", reason=type(e).__name__)
         
         return ""
     
+    def extract_status(self, text):
+        """從文字中提取狀態"""
+        return classify_text(text).status
+    
     def extract_category_from_element(self, element):
         """從元素中提取類別"""
         try:
-            text = element.text
-            categories = []
-            
-            category_keywords = {
-                '研究生': ['研究生', '碩士', '博士', 'graduate'],
-                '大學生': ['大學生', '學士', 'undergraduate'],
-                '清寒': ['清寒', '低收入'],
-                '優秀': ['優秀', '績優'],
-                '僑生': ['僑生'],
-                '外籍生': ['外籍', 'international']
-            }
-            
-            for category, keywords in category_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    categories.append(category)
-            
-            return ', '.join(categories)
-        except:
-            pass
+            return self.extract_category(element.text)
+        except Exception as e:
+            self.metrics.increment("field_failures_total", field="category", reason=type(e).__name__)
         
         return ""
     
+    def extract_category(self, text):
+        """從文字中提取類別"""
+        return ', '.join(classify_text(text).categories)
+    
     def is_scholarship_related(self, title: str) -> bool:
         """判斷標題是否與獎學金相關"""
         if not title or len(title.strip()) < 3:
             return False
-            
-        scholarship_keywords = [
-            "獎學金", "scholarship", "獎助", "補助", "津貼", 
-            "助學", "獎勵", "獎助學金", "教育基金", "學費減免"
-        ]
         
-        title_lower = title.lower()
-        return any(keyword in title_lower for keyword in scholarship_keywords)
+        return classify_text(title).relevant
     
     def filter_scholarships(self, scholarships: List[Scholarship], user_input: UserInput) -> List[Scholarship]:
         """根據用戶條件過濾獎學金"""
@@ -425,31 +2339,27 @@ class ScholarshipCrawler:
         
         for scholarship in scholarships:
             title_lower = scholarship.title.lower()
+            tags = classify_text(scholarship.title)
             is_match = False
             
             # 根據身份篩選
+            sources = posted_by(scholarship)
             if user_input.identity == Identity.OVERSEAS_CHINESE:
-                if "僑生" in title_lower or "overseas" in title_lower or scholarship.source == "僑陸組":
+                if Identity.OVERSEAS_CHINESE in tags.identities or "僑陸組" in sources:
                     is_match = True
             elif user_input.identity == Identity.INTERNATIONAL:
-                if "外籍" in title_lower or "international" in title_lower:
+                if Identity.INTERNATIONAL in tags.identities:
                     is_match = True
             else:  # 本國人
-                if "僑生" not in title_lower and "外籍" not in title_lower:
+                if not tags.non_local:
                     is_match = True
             
             # 根據學位層級篩選
-            level_keywords = {
-                Level.BACHELOR: ["學士", "大學", "undergraduate"],
-                Level.MASTER: ["碩士", "研究所", "master", "graduate"],
-                Level.DOCTOR: ["博士", "phd", "doctoral"]
-            }
-            
-            if any(keyword in title_lower for keyword in level_keywords.get(user_input.level, [])):
+            if user_input.level in tags.levels:
                 is_match = True
             
             # 根據系所篩選
-            if user_input.department in title_lower or scholarship.source.endswith(user_input.department):
+            if user_input.department in title_lower or any(s.endswith(user_input.department) for s in sources):
                 is_match = True
             
             if is_match:
@@ -461,106 +2371,925 @@ class ScholarshipCrawler:
         
         return filtered
     
+    def filter_batch(self, scholarships, users: Iterable[UserInput], processes=1) -> List[List[Scholarship]]:
+        """為多個用戶過濾同一批獎學金，結果與逐一呼叫 filter_scholarships 相同"""
+        users = list(users)
+        with self.metrics.timer("filter_seconds", count=len(users), method="batch"):
+            return BatchMatcher(scholarships).match(users, processes)
+    
     def is_potentially_relevant(self, scholarship: Scholarship, user_input: UserInput) -> bool:
         """寬鬆條件判斷獎學金是否可能相關"""
-        if (user_input.identity == Identity.OVERSEAS_CHINESE and scholarship.source == "僑陸組") or \
-           (scholarship.source == "生輔組") or \
-           (scholarship.source.endswith(user_input.department)):
+        sources = posted_by(scholarship)
+        if (user_input.identity == Identity.OVERSEAS_CHINESE and "僑陸組" in sources) or \
+           ("生輔組" in sources) or \
+           any(source.endswith(user_input.department) for source in sources):
             return True
             
         return False
 
+def _ids_to_bits(ids, size):
+    """將編號列表轉為位元集合"""
+    bits = bytearray((size + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+def _contains_sorted(values, value):
+    i = bisect.bisect_left(values, value)
+    return i < len(values) and values[i] == value
+
+def _bits_to_ids(mask):
+    """將位元集合轉為由小到大的編號列表"""
+    bits = bin(mask)[:1:-1]
+    ids = []
+    i = bits.find("1")
+    while i != -1:
+        ids.append(i)
+        i = bits.find("1", i + 1)
+    return ids
+
+class ScholarshipIndex:
+    """獎學金的倒排索引
+    
+    身份、學位層級、來源與類別各自有一份位元集合 (第 i 位代表第 i 筆)，
+    標題另有字元 unigram/bigram 索引供中文子字串查詢；gram 數量多且大多罕見，
+    以排序的編號陣列保存而非位元集合。filter 的結果與
+    ScholarshipCrawler.filter_scholarships 相同，但只需集合運算。
+    傳入 ScholarshipColumns 時直接以其作為記錄來源，不另外保留 Scholarship 物件 (此時不能 add)。
+    """
+    def __init__(self, scholarships=()):
+        self.records = scholarships if isinstance(scholarships, ScholarshipColumns) else []
+        self.ordinals = array("i")
+        self.deadlines = array("i")
+        self.postings: Dict[Any, int] = {}
+        self.grams: Dict[str, array] = {}
+        self.all = 0
+        self._date_order = None
+        if isinstance(scholarships, ScholarshipColumns):
+            for doc_id, scholarship in enumerate(scholarships):
+                self._index(doc_id, scholarship)
+        else:
+            for scholarship in scholarships:
+                self.add(scholarship)
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def add(self, scholarship: Scholarship) -> int:
+        doc_id = len(self.records)
+        self.records.append(scholarship)
+        self._index(doc_id, scholarship)
+        return doc_id
+    
+    def _index(self, doc_id, scholarship: Scholarship):
+        bit = 1 << doc_id
+        title_lower = scholarship.title.lower()
+        self.ordinals.append((scholarship.published_on or Date.min).toordinal())
+        self.deadlines.append(scholarship.deadline_on.toordinal() if scholarship.deadline_on else 0)
+        self.all |= bit
+        self._date_order = None
+        
+        tags = classify_text(scholarship.title)
+        keys = [("source", source) for source in posted_by(scholarship)]
+        keys += [("identity", identity) for identity in tags.identities]
+        keys += [("level", level) for level in tags.levels]
+        keys += [("category", category) for category in tags.categories]
+        if tags.non_local:
+            keys.append(("non_local", None))
+        if scholarship.status:
+            keys.append(("status", scholarship.status))
+        if scholarship.deadline_on is None and is_closed_by_status(scholarship):
+            keys.append(("closed", None))
+        for key in keys:
+            self.postings[key] = self.postings.get(key, 0) | bit
+        
+        for gram in {title_lower[i:i + n] for n in (1, 2) for i in range(len(title_lower) - n + 1)}:
+            postings = self.grams.get(gram)
+            if postings is None:
+                postings = self.grams[gram] = array("I")
+            postings.append(doc_id)
+    
+    def tagged(self, kind, value=None) -> int:
+        return self.postings.get((kind, value), 0)
+    
+    def sources(self):
+        return [value for kind, value in self.postings if kind == "source"]
+    
+    def title_contains(self, text) -> int:
+        """標題 (小寫) 含有 text 的項目"""
+        if not text:
+            return self.all
+        n = 2 if len(text) >= 2 else 1
+        postings = []
+        for gram in {text[i:i + n] for i in range(len(text) - n + 1)}:
+            ids = self.grams.get(gram)
+            if ids is None:
+                return 0
+            postings.append(ids)
+        
+        # 由最短的編號陣列開始，逐一以二分搜尋確認是否出現在其他陣列
+        postings.sort(key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            candidates = [doc_id for doc_id in candidates if _contains_sorted(ids, doc_id)]
+            if not candidates:
+                return 0
+        
+        if len(text) > 2:
+            # bigram 只能篩出候選，較長的字串需再確認
+            candidates = [doc_id for doc_id in candidates if text in self._title(doc_id).lower()]
+        return _ids_to_bits(candidates, len(self.records))
+    
+    def _title(self, doc_id):
+        records = self.records
+        if isinstance(records, ScholarshipColumns):
+            return records.field("title", doc_id)
+        return records[doc_id].title
+    
+    def source_endswith(self, suffix) -> int:
+        mask = 0
+        for source in self.sources():
+            if source.endswith(suffix):
+                mask |= self.tagged("source", source)
+        return mask
+    
+    def identity_mask(self, identity: Identity) -> int:
+        if identity == Identity.OVERSEAS_CHINESE:
+            return self.tagged("identity", Identity.OVERSEAS_CHINESE) | self.tagged("source", "僑陸組")
+        if identity == Identity.INTERNATIONAL:
+            return self.tagged("identity", Identity.INTERNATIONAL)
+        return self.all & ~self.tagged("non_local")
+    
+    def department_mask(self, department) -> int:
+        return self.title_contains(department) | self.source_endswith(department)
+    
+    def match_masks(self, user_input: UserInput):
+        """回傳 (身份, 學位層級, 系所) 三個條件各自符合的位元集合"""
+        return (self.identity_mask(user_input.identity), self.tagged("level", user_input.level),
+                self.department_mask(user_input.department))
+    
+    def fallback_mask(self, user_input: UserInput) -> int:
+        """與 is_potentially_relevant 相同的寬鬆條件"""
+        mask = self.tagged("source", "生輔組") | self.source_endswith(user_input.department)
+        if user_input.identity == Identity.OVERSEAS_CHINESE:
+            mask |= self.tagged("source", "僑陸組")
+        return mask
+    
+    def _date_orders(self):
+        """依公告日期與截止日期排序的 (日期, 編號, 前綴位元集合)，索引變更後第一次查詢時重建
+        
+        前綴位元集合每隔約 1/64 的長度記錄一次排序後前 k 筆的聯集，任一範圍的位元集合
+        只需兩個前綴相減再補上頭尾不滿一段的項目。
+        """
+        order = self._date_order
+        if order is None:
+            size = len(self.records)
+            step = max(1, -(-size // 64))
+            order = []
+            for values in (self.ordinals, self.deadlines):
+                ids = array("I", sorted(range(size), key=values.__getitem__))
+                prefixes = [0]
+                for start in range(0, size, step):
+                    prefixes.append(prefixes[-1] | _ids_to_bits(ids[start:start + step], size))
+                order.append((array("i", (values[doc_id] for doc_id in ids)), ids, prefixes))
+            order = self._date_order = (tuple(order), step)
+        return order
+    
+    def _span(self, ids, prefixes, step, start, stop) -> int:
+        """排序後第 start 到 stop 筆項目的位元集合"""
+        size = len(self.records)
+        first, last = -(-start // step), stop // step
+        if first >= last:
+            return _ids_to_bits(ids[start:stop], size)
+        return (prefixes[last] & ~prefixes[first]) | _ids_to_bits(ids[start:first * step], size) | \
+            _ids_to_bits(ids[last * step:stop], size)
+    
+    def date_mask(self, since: Date = None, until: Date = None, open_only=False, today: Date = None) -> int:
+        """與 filter_by_date 相同條件的位元集合；在依日期排序的陣列上以二分搜尋找出範圍"""
+        if since is None and until is None and not open_only:
+            return self.all
+        (published, deadline), step = self._date_orders()
+        mask = self.all
+        if since is not None or until is not None:
+            dates, ids, prefixes = published
+            # 公告日期不明 (Date.min) 的項目排在最前面，一律保留
+            known = bisect.bisect_right(dates, Date.min.toordinal())
+            low = bisect.bisect_left(dates, since.toordinal(), known) if since else known
+            high = bisect.bisect_right(dates, until.toordinal(), known) if until else len(dates)
+            mask &= self._span(ids, prefixes, step, 0, known) | self._span(ids, prefixes, step, low, max(low, high))
+        if open_only:
+            dates, ids, prefixes = deadline
+            # 截止日期不明 (0) 的項目排在最前面；截止日期早於今天的項目排除
+            known = bisect.bisect_right(dates, 0)
+            past = bisect.bisect_left(dates, (today or Date.today()).toordinal(), known)
+            mask &= self._span(ids, prefixes, step, 0, known) | self._span(ids, prefixes, step, past, len(dates))
+            mask &= ~self.tagged("closed")
+        return mask
+    
+    def filter(self, user_input: UserInput, within=None) -> List[Scholarship]:
+        """結果與 filter_scholarships 相同 (含放寬條件)；within 限制候選項目 (如 date_mask)"""
+        within = self.all if within is None else within
+        identity, level, department = self.match_masks(user_input)
+        mask = (identity | level | department) & within
+        if not mask:
+            mask = self.fallback_mask(user_input) & within
+        return [self.records[doc_id] for doc_id in _bits_to_ids(mask)]
+    
+    def search(self, user_input: UserInput, page=1, page_size=20, within=None) -> Dict[str, Any]:
+        """依符合條件數與日期 (新到舊) 排序的分頁查詢；page 由 1 起算"""
+        if page < 1 or page_size < 1:
+            raise ValueError(f"page 與 page_size 必須大於 0 (page={page}, page_size={page_size})")
+        within = self.all if within is None else within
+        identity, level, department = (m & within for m in self.match_masks(user_input))
+        mask = identity | level | department
+        if mask:
+            all_three = identity & level & department
+            two = ((identity & level) | (identity & department) | (level & department)) & ~all_three
+            groups = [all_three, two, mask & ~(all_three | two)]
+        else:
+            groups = [self.fallback_mask(user_input) & within]
+        
+        ranked = []
+        ordinals = self.ordinals
+        for group in groups:
+            ranked.extend(sorted(_bits_to_ids(group), key=lambda doc_id: -ordinals[doc_id]))
+        
+        start = (page - 1) * page_size
+        return {
+            "data": [self.records[doc_id] for doc_id in ranked[start:start + page_size]],
+            "total": len(ranked),
+            "page": page,
+            "page_size": page_size
+        }
+
+class BatchMatcher:
+    """為大量用戶過濾同一批獎學金
+    
+    結果只取決於用戶的身份、學位層級與系所，條件相同的用戶只計算一次；各條件符合的項目
+    以 ScholarshipIndex 的位元集合表示並快取，組合時只需位元運算。不同條件組合很多時
+    可分給多個行程計算。結果與逐一呼叫 filter_scholarships 相同 (含放寬條件)。
+    """
+    def __init__(self, scholarships):
+        self.index = scholarships if isinstance(scholarships, ScholarshipIndex) else ScholarshipIndex(scholarships)
+        self._masks = {}
+    
+    @staticmethod
+    def profile_key(user_input: UserInput):
+        return (user_input.identity, user_input.level, user_input.department)
+    
+    def _mask(self, kind, value, compute):
+        mask = self._masks.get((kind, value))
+        if mask is None:
+            mask = self._masks[(kind, value)] = compute(value)
+        return mask
+    
+    def match_key(self, key) -> Tuple[int, ...]:
+        """條件組合 (身份, 學位層級, 系所) 符合的項目編號"""
+        identity, level, department = key
+        index = self.index
+        mask = self._mask("identity", identity, index.identity_mask) | \
+            self._mask("level", level, partial(index.tagged, "level")) | \
+            self._mask("department", department, index.department_mask)
+        if not mask:
+            mask = index.tagged("source", "生輔組") | self._mask("source_suffix", department, index.source_endswith)
+            if identity == Identity.OVERSEAS_CHINESE:
+                mask |= index.tagged("source", "僑陸組")
+        return tuple(_bits_to_ids(mask))
+    
+    def match_ids(self, users: Iterable[UserInput], processes=1, chunk_size=256) -> List[Tuple[int, ...]]:
+        """依 users 的順序回傳各自符合的項目編號，條件相同的用戶共用同一個 tuple
+        
+        processes 大於 1 且不同條件組合超過 chunk_size 個時，每 chunk_size 個分給一個行程。
+        """
+        users = list(users)
+        distinct = list(dict.fromkeys(self.profile_key(user) for user in users))
+        if processes > 1 and len(distinct) > chunk_size:
+            chunks = [distinct[i:i + chunk_size] for i in range(0, len(distinct), chunk_size)]
+            with ProcessPoolExecutor(processes, initializer=_init_batch_worker,
+                                     initargs=(self.index.records,)) as executor:
+                results = [ids for chunk in executor.map(_match_batch_chunk, chunks) for ids in chunk]
+        else:
+            results = [self.match_key(key) for key in distinct]
+        
+        by_key = dict(zip(distinct, results))
+        return [by_key[self.profile_key(user)] for user in users]
+    
+    def match(self, users: Iterable[UserInput], processes=1, chunk_size=256) -> List[List[Scholarship]]:
+        """依 users 的順序回傳各自的過濾結果"""
+        records = self.index.records
+        materialized = {}
+        results = []
+        for ids in self.match_ids(users, processes, chunk_size):
+            scholarships = materialized.get(ids)
+            if scholarships is None:
+                scholarships = materialized[ids] = [records[doc_id] for doc_id in ids]
+            results.append(list(scholarships))
+        return results
+
+# 工作行程各自建立一份 BatchMatcher
+_batch_matcher = None
+
+def _init_batch_worker(scholarships):
+    global _batch_matcher
+    _batch_matcher = BatchMatcher(scholarships)
+
+def _match_batch_chunk(keys):
+    return [_batch_matcher.match_key(key) for key in keys]
+
+# 匯出欄位順序
+EXPORT_COLUMNS = [
+    'title', 'source', 'date', 'status', 'category', 'url',
+    'description', 'deadline', 'amount', 'contact', 'crawl_time'
+]
+
+def _export_rows(scholarships: Iterable[Scholarship], crawl_time=None):
+    """逐筆產生匯出用的列，crawl_time 整批只計算一次；合併後的項目列出所有公告來源"""
+    crawl_time = crawl_time or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for s in scholarships:
+        yield (s.title, "、".join(posted_by(s)), s.date, s.status, s.category, s.url,
+               s.description, s.deadline, s.amount, s.contact, crawl_time)
+
+def export_jsonl(scholarships: Iterable[Scholarship], path) -> int:
+    """以 JSON Lines 串流寫出，回傳筆數"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in _export_rows(scholarships):
+            f.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def export_csv(scholarships: Iterable[Scholarship], path) -> int:
+    """以 CSV (UTF-8 BOM，Excel 可直接開啟) 串流寫出，回傳筆數"""
+    count = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in _export_rows(scholarships):
+            writer.writerow(row)
+            count += 1
+    return count
+
+def export_parquet(scholarships: Iterable[Scholarship], path, batch_size=10000) -> int:
+    """分批寫出 Parquet (需要 pyarrow)，回傳筆數"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("匯出 Parquet 需要安裝 pyarrow")
+    
+    schema = pa.schema([(column, pa.string()) for column in EXPORT_COLUMNS])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        rows = _export_rows(scholarships)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            columns = [pa.array(values, type=pa.string()) for values in zip(*batch)]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+            count += len(batch)
+    return count
+
+def export_excel(scholarships: Iterable[Scholarship], path, sheet_name='獎學金列表') -> int:
+    """以 openpyxl write-only 模式串流寫出 Excel，回傳筆數
+    
+    write-only 模式必須在寫入資料前設定欄寬，因此先將資料暫存到磁碟並同時
+    統計各欄最大長度，第二次讀取時才寫入活頁簿，記憶體用量不隨筆數增加。
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+    
+    widths = [len(column) for column in EXPORT_COLUMNS]
+    count = 0
+    with tempfile.TemporaryFile("w+", encoding="utf-8", newline="") as spool:
+        writer = csv.writer(spool)
+        for row in _export_rows(scholarships):
+            writer.writerow(row)
+            widths = [max(width, len(value)) for width, value in zip(widths, row)]
+            count += 1
+        spool.seek(0)
+        
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(sheet_name)
+        for i, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[get_column_letter(i)].width = min(width + 2, 50)
+        worksheet.append(EXPORT_COLUMNS)
+        for row in csv.reader(spool):
+            worksheet.append(row)
+        workbook.save(path)
+    return count
+
+EXPORTERS = {
+    ".jsonl": export_jsonl,
+    ".csv": export_csv,
+    ".parquet": export_parquet,
+    ".xlsx": export_excel
+}
+
+@dataclass(frozen=True)
+class ScholarshipSnapshot:
+    """某次全來源爬取的不可變結果，可同時供多個查詢使用"""
+    version: int
+    created_at: datetime
+    scholarships: ScholarshipColumns
+    sources: Dict[str, Any]
+    index: ScholarshipIndex = None
+
 class ScholarshipFinder:
-    def __init__(self):
-        self.crawler = ScholarshipCrawler()
+    def __init__(self, pool_size=2, max_page_loads=50, cache_path=None, cache_ttl=3600, selector_path=None,
+                 metrics: Metrics = None):
+        cache = PageCache(cache_path, default_ttl=cache_ttl) if cache_path else None
+        selector_memory = SelectorMemory(selector_path) if selector_path else None
+        detail_cache = DetailCache(cache_path) if cache_path else None
+        self.crawler = ScholarshipCrawler(pool_size=pool_size, max_page_loads=max_page_loads, cache=cache,
+                                          selector_memory=selector_memory, detail_cache=detail_cache,
+                                          metrics=metrics)
+        self.metrics = self.crawler.metrics
         
+        # 最近幾個版本的快照；查詢只讀取參照，不會被進行中的更新阻塞
+        self._snapshots = deque(maxlen=3)
+        self._refresh_lock = threading.Lock()
+
+    def close(self):
+        """釋放爬蟲使用的瀏覽器"""
+        self.crawler.close()
+
     def get_available_departments(self) -> List[str]:
         """獲取可用的系所列表"""
         return list(self.crawler.departments.keys())
     
-    def search_scholarships(self, user_input: UserInput, max_pages_per_source=3) -> Dict[str, Any]:
-        """搜尋獎學金"""
-        print("開始搜尋獎學金...")
-        
-        all_scholarships = []
+    def plan_sources(self, user_input: UserInput):
+        """根據用戶條件決定要爬取的來源"""
+        crawlers = self.crawler.crawlers
         
-        # 根據身份決定爬取來源
-        if user_input.identity == Identity.OVERSEAS_CHINESE:
-            print("正在爬取僑陸組...")
-            all_scholarships.extend(self.crawler.crawl_overseas_affairs(max_pages_per_source))
+        # 依來源設定的身份與系所限制決定，未限制的來源 (如生輔組) 所有人都可能適用
+        return [(name, crawlers[name]) for name, source in self.crawler.sources.items()
+                if source.applies_to(user_input)]
+    
+    def search_scholarships(self, user_input: UserInput, max_pages_per_source=3,
+                            parallel=False, max_workers=3, source_timeout=60, enrich=False,
+                            since: Date = None, until: Date = None, open_only=False) -> Dict[str, Any]:
+        """搜尋獎學金 (search_scholarships_async 的同步版本)"""
+        return asyncio.run(self.search_scholarships_async(
+            user_input, max_pages_per_source, max_workers=max_workers if parallel else 1,
+            source_timeout=source_timeout, enrich=enrich, since=since, until=until, open_only=open_only))
+    
+    async def search_scholarships_async(self, user_input: UserInput, max_pages_per_source=3,
+                                        max_workers=3, source_timeout=60, enrich=False,
+                                        since: Date = None, until: Date = None, open_only=False) -> Dict[str, Any]:
+        """搜尋獎學金
         
-        # 所有人都可能適用生輔組獎學金
-        print("正在爬取生輔組...")
-        all_scholarships.extend(self.crawler.crawl_student_affairs(max_pages_per_source))
+        最多 max_workers 個來源同時爬取，超過 source_timeout 秒的來源會被取消，
+        不影響其他來源的結果；失敗的來源在已有快照時沿用快照中的項目。enrich 為 True 時抓取過濾後項目的詳細頁。
+        指定 since 時整頁都早於 since 即停止往後爬取；since/until/open_only 在用戶條件過濾前套用。
+        """
+        print("開始搜尋獎學金...")
         
-        # 如果是資工系相關
-        if "資工" in user_input.department:
-            print("正在爬取資工系...")
-            all_scholarships.extend(self.crawler.crawl_csie(max_pages_per_source))
+        sources = {}
+        plan = self.plan_sources(user_input)
+        all_scholarships = await self.crawl_sources_async(
+            plan, max_pages_per_source, max_workers, source_timeout, sources, page_cutoff=since)
         
         print(f"共爬取到 {len(all_scholarships)} 個獎學金項目")
         
+        self._fall_back_to_snapshot(self.snapshot, sources, all_scholarships)
+        all_scholarships = deduplicate(all_scholarships)
+        print(f"合併重複項目後剩餘 {len(all_scholarships)} 個項目")
+        
+        if since or until or open_only:
+            all_scholarships = filter_by_date(all_scholarships, since, until, open_only)
+            print(f"日期篩選後剩餘 {len(all_scholarships)} 個項目")
+        
         # 根據用戶條件過濾
-        filtered_scholarships = self.crawler.filter_scholarships(all_scholarships, user_input)
+        with self.metrics.timer("filter_seconds", method="scan"):
+            filtered_scholarships = self.crawler.filter_scholarships(all_scholarships, user_input)
         print(f"過濾後剩餘 {len(filtered_scholarships)} 個相關項目")
         
-        return {"data": filtered_scholarships}
+        if enrich:
+            filtered_scholarships = await self.crawler.run_async(self.crawler.enrich, filtered_scholarships)
+            if open_only:
+                # 詳細頁補上截止日期後再確認一次
+                filtered_scholarships = [s for s in filtered_scholarships if is_still_open(s)]
+        
+        return {"data": filtered_scholarships, "sources": sources}
+    
+    def crawl_sources(self, plan, max_pages, max_workers, source_timeout, sources,
+                      page_cutoff: Date = None, known_keys: Dict[str, set] = None) -> List[Scholarship]:
+        """crawl_sources_async 的同步版本"""
+        return asyncio.run(self.crawl_sources_async(plan, max_pages, max_workers, source_timeout, sources,
+                                                    page_cutoff, known_keys))
+    
+    async def crawl_sources_async(self, plan, max_pages, max_workers, source_timeout, sources,
+                                  page_cutoff: Date = None, known_keys: Dict[str, set] = None) -> List[Scholarship]:
+        """同時爬取多個來源，每完成一個就合併結果，各來源的耗時、錯誤與停止原因記錄在 sources
+        
+        page_cutoff 與 known_keys (來源 -> 已知項目鍵) 只套用於這次呼叫的爬取。
+        """
+        all_scholarships = []
+        semaphore = asyncio.Semaphore(max_workers)
+        
+        async def run(source_name, crawl):
+            async with semaphore:
+                print(f"正在爬取{source_name}...")
+                start = time.monotonic()
+                crawl_run = CrawlRun(page_cutoff, (known_keys or {}).get(source_name))
+                try:
+                    scholarships = await self.crawler.run_async(partial(crawl, run=crawl_run), max_pages,
+                                                                timeout=source_timeout)
+                    error = crawl_run.error
+                except asyncio.TimeoutError:
+                    scholarships, error = [], TimeoutError(f"超過 {source_timeout} 秒")
+                    print(f"{source_name} 逾時，略過")
+                except Exception as e:
+                    scholarships, error = [], e
+                elapsed = time.monotonic() - start
+                self.metrics.observe("source_crawl_seconds", elapsed, source=source_name)
+                if error:
+                    self.metrics.increment("source_errors_total", source=source_name, reason=type(error).__name__)
+                all_scholarships.extend(scholarships)
+                sources[source_name] = self._source_report(len(scholarships), elapsed, error, crawl_run.stale,
+                                                           "error" if error else crawl_run.stop_reason)
+                print(f"{source_name} 完成，{len(scholarships)} 個項目，耗時 {elapsed:.1f} 秒")
+        
+        await asyncio.gather(*(run(source_name, crawl) for source_name, crawl in plan))
+        return all_scholarships
+    
+    @property
+    def snapshot(self) -> ScholarshipSnapshot:
+        """目前最新的快照，尚未建立時為 None"""
+        snapshots = self._snapshots
+        return snapshots[-1] if snapshots else None
+    
+    def get_snapshot(self, version=None) -> ScholarshipSnapshot:
+        """取得指定版本的快照 (僅保留最近幾個版本)"""
+        if version is None:
+            return self.snapshot
+        for snapshot in list(self._snapshots):
+            if snapshot.version == version:
+                return snapshot
+        return None
+    
+    def refresh_snapshot(self, max_pages_per_source=3, parallel=True, max_workers=3,
+                         source_timeout=60, enrich=False, sources=None) -> ScholarshipSnapshot:
+        """爬取所有來源 (或 sources 中的來源) 並發布新版本的快照
+        
+        本次未爬取的來源，以及爬取失敗且沒有任何結果的來源，沿用上一版快照中的項目。
+        各來源重複公告的項目合併為一筆，sources 欄位記錄所有公告來源。
+        enrich 為 True 時補上詳細頁欄位，只有新增或變更的項目需要抓取詳細頁。
+        """
+        with self._refresh_lock:
+            previous = self.snapshot
+            crawlers = self.crawler.crawlers
+            plan = [(name, crawlers[name]) for name in (sources or crawlers)]
+            reports = {}
+            all_scholarships = self.crawl_sources(
+                plan, max_pages_per_source, max_workers if parallel else 1, source_timeout, reports)
+            
+            if previous is not None:
+                # 本次未爬取的來源沿用上一版的報告，項目與失敗的來源一併由上一版帶入
+                kept = {source_name for source_name in previous.sources if source_name not in reports}
+                for source_name in kept:
+                    reports[source_name] = previous.sources[source_name]
+                self._fall_back_to_snapshot(previous, reports, all_scholarships, kept)
+            
+            all_scholarships = deduplicate(all_scholarships)
+            if enrich:
+                all_scholarships = self.crawler.enrich(all_scholarships)
+            
+            columns = ScholarshipColumns(all_scholarships)
+            snapshot = ScholarshipSnapshot(
+                version=previous.version + 1 if previous else 1,
+                created_at=datetime.now(),
+                scholarships=columns,
+                sources=reports,
+                index=ScholarshipIndex(columns)
+            )
+            self._snapshots.append(snapshot)
+            print(f"快照已更新至第 {snapshot.version} 版，共 {len(snapshot.scholarships)} 個項目")
+            return snapshot
+    
+    def query(self, user_input: UserInput, version=None, page=None, page_size=20,
+              since: Date = None, until: Date = None, open_only=False) -> Dict[str, Any]:
+        """以最新 (或指定版本) 的快照回答用戶查詢，不觸發爬取 (除非尚無快照)
+        
+        未指定 page 時回傳與 filter_scholarships 相同的完整結果；
+        指定 page 時回傳依相關程度排序的該頁結果與總數。
+        since/until/open_only 與 filter_by_date 相同，在用戶條件過濾前套用。
+        """
+        snapshot = self.get_snapshot(version)
+        if snapshot is None:
+            if version is not None:
+                raise KeyError(f"快照版本 {version} 已不存在")
+            snapshot = self.refresh_snapshot()
+        
+        with self.metrics.timer("filter_seconds", method="index"):
+            within = snapshot.index.date_mask(since, until, open_only)
+            if page is None:
+                result = {"data": snapshot.index.filter(user_input, within)}
+            else:
+                result = snapshot.index.search(user_input, page=page, page_size=page_size, within=within)
+        result["version"] = snapshot.version
+        result["created_at"] = snapshot.created_at.isoformat(timespec="seconds")
+        return result
+    
+    def crawl_incremental(self, store: SeenStore, sources=None, max_pages_per_source=3,
+                          feed_path=None, parallel=True, max_workers=3, source_timeout=60,
+                          enrich=False, since: Date = None, until: Date = None,
+                          open_only=False) -> List[Dict[str, Any]]:
+        """增量爬取：只回報新增、變更與移除的項目，並可附加寫入 JSON Lines 變更紀錄
+        
+        enrich 為 True 時只抓取新增與變更項目的詳細頁，補入事件的 scholarship 欄位。
+        指定 since 時整頁都早於 since 即停止往後爬取；since/until/open_only 只影響回報的
+        新增與變更事件，已保存的項目照常更新。
+        """
+        crawlers = self.crawler.crawlers
+        plan = [(name, crawlers[name]) for name in (sources or crawlers)]
+        reports = {}
+        
+        known_keys = {source_name: store.keys(source_name) for source_name, _ in plan}
+        all_scholarships = self.crawl_sources(
+            plan, max_pages_per_source, max_workers if parallel else 1, source_timeout, reports,
+            page_cutoff=since, known_keys=known_keys)
+        
+        changes = []
+        for source_name, _ in plan:
+            report = reports.get(source_name)
+            if report is None or (report["error"] and report["count"] == 0):
+                continue
+            stop_reason = report["stop_reason"]
+            scholarships = [s for s in all_scholarships if s.source == source_name]
+            changes.extend(store.apply(source_name, scholarships, stop_reason))
+        
+        if since or until or open_only or enrich:
+            updated = [(c, scholarship_from_record(c["scholarship"])) for c in changes if c["type"] != "removed"]
+            updated = [(c, s) for c, s in updated if filter_by_date([s], since, until, open_only)]
+            if enrich and updated:
+                enriched = self.crawler.enrich([s for _, s in updated])
+                updated = [(c, s) for (c, _), s in zip(updated, enriched) if not open_only or is_still_open(s)]
+            for change, scholarship in updated:
+                change["scholarship"] = scholarship_record(scholarship)
+            kept = {id(change) for change, _ in updated}
+            changes = [c for c in changes if c["type"] == "removed" or id(c) in kept]
+        
+        counts = {change: sum(1 for c in changes if c["type"] == change) for change in ("new", "changed", "removed")}
+        print(f"增量爬取完成: 新增 {counts['new']}，變更 {counts['changed']}，移除 {counts['removed']}")
+        
+        if feed_path and changes:
+            with open(feed_path, "a", encoding="utf-8") as f:
+                for change in changes:
+                    f.write(json.dumps(change, ensure_ascii=False) + "\n")
+        
+        return changes
+    
+    def _source_report(self, count, elapsed, error, stale=False, stop_reason=None):
+        return {
+            "count": count,
+            "elapsed": round(elapsed, 3),
+            "error": str(error) if error else None,
+            "stale": stale,
+            "stop_reason": stop_reason
+        }
     
-    def save_to_excel(self, scholarships: List[Scholarship], filename=None):
+    def _fall_back_to_snapshot(self, snapshot: ScholarshipSnapshot, reports, scholarships: List[Scholarship],
+                               kept=()):
+        """爬取失敗且沒有任何結果的來源 (標記為 stale) 與 kept 中的來源，沿用快照中的項目
+        
+        合併過的項目只保留這些來源的公告，本次重新爬取的來源由新結果決定，之後需再合併重複項目。
+        """
+        if snapshot is None:
+            return
+        failed = set()
+        for source_name, report in reports.items():
+            if source_name not in kept and report["error"] and report["count"] == 0:
+                failed.add(source_name)
+                report["stale"] = True
+        kept = failed | set(kept)
+        if not kept:
+            return
+        
+        counts = dict.fromkeys(failed, 0)
+        for scholarship in snapshot.scholarships:
+            remaining = tuple(source for source in posted_by(scholarship) if source in kept)
+            if not remaining:
+                continue
+            scholarships.append(replace(scholarship, source=remaining[0],
+                                        sources=remaining if len(remaining) > 1 else ()))
+            for source in remaining:
+                if source in counts:
+                    counts[source] += 1
+        for source_name, count in counts.items():
+            print(f"{source_name} 爬取失敗，沿用第 {snapshot.version} 版快照的 {count} 個項目")
+    
+    def save_to_excel(self, scholarships: Iterable[Scholarship], filename=None):
         """將獎學金數據保存到Excel文件"""
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f'scholarships_{timestamp}.xlsx'
         
-        # 轉換為字典列表
-        data = []
-        for scholarship in scholarships:
-            data.append({
-                'title': scholarship.title,
-                'source': scholarship.source,
-                'date': scholarship.date,
-                'status': scholarship.status,
-                'category': scholarship.category,
-                'url': scholarship.url,
-                'description': scholarship.description,
-                'deadline': scholarship.deadline,
-                'amount': scholarship.amount,
-                'contact': scholarship.contact,
-                'crawl_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
-        
-        # 創建DataFrame
-        df = pd.DataFrame(data)
+        return self.export(scholarships, filename)
+    
+    def export(self, scholarships: Iterable[Scholarship], filename):
+        """依副檔名 (.xlsx/.csv/.jsonl/.parquet) 串流匯出，可直接傳入產生器"""
+        extension = os.path.splitext(filename)[1].lower()
+        exporter = EXPORTERS.get(extension)
+        if exporter is None:
+            raise ValueError(f"不支援的匯出格式: {extension}")
         
-        if df.empty:
+        scholarships = iter(scholarships)
+        first = next(scholarships, None)
+        if first is None:
             print("沒有數據可以保存")
             return None
         
-        # 保存到Excel
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='獎學金列表', index=False)
+        with self.metrics.timer("export_seconds", format=extension.lstrip(".")):
+            count = exporter(itertools.chain([first], scholarships), filename)
+        print(f"數據已保存到: {filename} ({count} 筆)")
+        return filename
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """ScholarshipService 的 HTTP 端點：/query、/health 與 /metrics"""
+    def do_GET(self):
+        service = self.server.service
+        parts = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        try:
+            if parts.path == "/query":
+                status, body = service.handle_query(params)
+            elif parts.path == "/health":
+                status, body = 200, service.health()
+            elif parts.path == "/metrics":
+                self._send(200, render_prometheus(service.finder.metrics.snapshot()), "text/plain; version=0.0.4")
+                return
+            else:
+                status, body = 404, {"error": f"未知的路徑 {parts.path}"}
+        except Exception as e:
+            status, body = 500, {"error": str(e)}
+        self._send(status, json.dumps(body, ensure_ascii=False), "application/json")
+    
+    def _send(self, status, text, content_type):
+        payload = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+class ScholarshipService:
+    """常駐服務：保留瀏覽器與快照，在背景依各來源的 refresh_interval 更新快照，
+    並以本機 HTTP 端點從最新快照回答查詢，查詢不需等待爬取
+    
+    每次排程時間加上 ±jitter 比例的隨機偏移，避免各來源同時爬取；
+    失敗的來源在 retry_interval 秒後重試。
+    """
+    def __init__(self, finder: ScholarshipFinder, host="127.0.0.1", port=8080, jitter=0.1,
+                 retry_interval=300, max_pages_per_source=3, enrich=False):
+        self.finder = finder
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.max_pages_per_source = max_pages_per_source
+        self.enrich = enrich
+        self.next_refresh = {}
+        self._stop = threading.Event()
+        self._random = random.Random()
+        self._scheduler = None
+        self.server = ThreadingHTTPServer((host, port), _ServiceHandler)
+        self.server.daemon_threads = True
+        self.server.service = self
+    
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """啟動排程與 HTTP 端點 (皆在背景執行緒)"""
+        self._scheduler = threading.Thread(target=self._schedule_loop, name="refresh", daemon=True)
+        self._scheduler.start()
+        threading.Thread(target=self.server.serve_forever, name="http", daemon=True).start()
+        print(f"服務已啟動: {self.address}")
+    
+    def stop(self):
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+        if self._scheduler is not None:
+            self._scheduler.join()
+    
+    def run(self):
+        """啟動並持續執行直到 Ctrl+C"""
+        self.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            print("\n正在停止服務...")
+        finally:
+            self.stop()
+    
+    def _delay(self, interval):
+        return interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+    
+    def _schedule_loop(self):
+        sources = self.finder.crawler.sources
+        # 啟動時立即爬取所有來源
+        self.next_refresh = {name: 0.0 for name in sources}
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [name for name, at in self.next_refresh.items() if at <= now]
+            if not due:
+                self._stop.wait(min(self.next_refresh.values()) - now)
+                continue
             
-            # 調整欄位寬度
-            worksheet = writer.sheets['獎學金列表']
-            for column in worksheet.columns:
-                max_length = 0
-                column_name = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_name].width = adjusted_width
+            try:
+                snapshot = self.finder.refresh_snapshot(
+                    max_pages_per_source=self.max_pages_per_source, sources=due, enrich=self.enrich)
+                reports = snapshot.sources
+            except Exception as e:
+                print(f"更新快照時出錯: {e}")
+                reports = {}
+            
+            now = time.monotonic()
+            for name in due:
+                report = reports.get(name)
+                failed = report is None or report.get("stale") or report["error"]
+                interval = min(self.retry_interval, sources[name].refresh_interval) if failed else \
+                    sources[name].refresh_interval
+                self.next_refresh[name] = now + self._delay(interval)
+    
+    def handle_query(self, params):
+        """以查詢參數建立 UserInput 並從最新快照回答，回傳 (HTTP 狀態碼, 內容)"""
+        if self.finder.snapshot is None:
+            return 503, {"error": "快照尚未建立，請稍後再試"}
+        try:
+            # 空字串包含於所有標題，未指定系所會回傳整個快照
+            department = params.get("department", "").strip()
+            if not department:
+                raise ValueError("缺少 department")
+            user_input = UserInput(
+                department=department,
+                level=Level(params.get("level", Level.BACHELOR.value)),
+                year=int(params.get("year", 1)),
+                identity=Identity(params.get("identity", Identity.LOCAL.value)),
+                study_type=StudyType(params.get("study_type", StudyType.FULL_TIME.value))
+            )
+            page = int(params["page"]) if "page" in params else None
+            page_size = int(params.get("page_size", 20))
+            if (page is not None and page < 1) or page_size < 1:
+                raise ValueError("page 與 page_size 必須大於 0")
+            since = Date.fromisoformat(params["since"]) if params.get("since") else None
+            until = Date.fromisoformat(params["until"]) if params.get("until") else None
+            version = int(params["version"]) if "version" in params else None
+        except ValueError as e:
+            return 400, {"error": f"查詢參數有誤: {e}"}
+        open_only = params.get("open_only", "").lower() in ("1", "true", "yes")
         
-        print(f"數據已保存到: {filename}")
-        return filename
+        try:
+            result = self.finder.query(user_input, version=version, page=page, page_size=page_size,
+                                       since=since, until=until, open_only=open_only)
+        except KeyError as e:
+            return 404, {"error": str(e.args[0])}
+        result["data"] = [scholarship_record(s) for s in result["data"]]
+        return 200, result
+    
+    def health(self):
+        snapshot = self.finder.snapshot
+        now = time.monotonic()
+        return {
+            "version": snapshot.version if snapshot else None,
+            "created_at": snapshot.created_at.isoformat(timespec="seconds") if snapshot else None,
+            "items": len(snapshot.scholarships) if snapshot else 0,
+            "sources": snapshot.sources if snapshot else {},
+            "next_refresh_in": {name: round(max(0.0, at - now), 1) for name, at in self.next_refresh.items()}
+        }
+
 
 def main():
-    finder = ScholarshipFinder()
+    parser = argparse.ArgumentParser(description="獎學金查詢系統")
+    parser.add_argument("--profile", action="store_true", help="結束時列出各階段耗時與失敗次數")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="將指標寫入檔案 (.prom 為 Prometheus 文字格式，其他為 JSON Lines)")
+    parser.add_argument("--serve", action="store_true", help="以常駐服務模式執行，定期更新並以 HTTP 回答查詢")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache", metavar="PATH", help="列表頁與詳細頁快取的 SQLite 檔")
+    parser.add_argument("--selector-db", metavar="PATH", default="scholarship_selectors.db",
+                        help="記住各來源有效選擇器的 SQLite 檔，下次執行先嘗試該選擇器 (預設: %(default)s)")
+    args = parser.parse_args()
+    
+    sinks = []
+    if args.metrics:
+        sinks.append(PrometheusTextSink(args.metrics) if args.metrics.endswith(".prom") else JsonLogSink(args.metrics))
+    finder = ScholarshipFinder(cache_path=args.cache, selector_path=args.selector_db, metrics=Metrics(sinks))
+    
+    if args.serve:
+        try:
+            ScholarshipService(finder, host=args.host, port=args.port).run()
+        finally:
+            finder.close()
+        return
     
     print("=== 獎學金查詢系統 - 特定URL版本 ===")
     print("支援網站:")
@@ -617,6 +3346,11 @@ def main():
         
     except Exception as e:
         print(f"查詢過程中出錯: {e}")
+    finally:
+        finder.close()
+        if args.profile:
+            print("\n=== 效能分析 ===")
+            print(finder.metrics.report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""BatchMatcher 的結果須與逐一呼叫 filter_scholarships 相同"""
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import (
+    BatchMatcher, Identity, Level, Scholarship, ScholarshipColumns, ScholarshipCrawler, StudyType, UserInput,
+    deduplicate
+)
+
+TITLES = [
+    "碩士班研究生獎助學金", "博士班 研究獎學金", "學士班 工讀", "資工系 清寒獎學金", "僑生獎學金",
+    "外籍生獎學金", "在職專班 獎學金", "電機系 優秀學生獎", "系務會議紀錄"
+]
+# 只有非本國生的項目，多數條件沒有嚴格匹配，會走放寬條件
+NON_LOCAL_TITLES = ["外籍生工讀金", "僑生清寒助學金", "外籍生 International Grant", "僑生 生活補助"]
+SOURCES = ["生輔組", "資工系", "僑陸組", "電機系"]
+DEPARTMENTS = ["資工系", "電機系", "資工", "系", "機械系"]
+
+def corpus(titles, size, seed):
+    rng = random.Random(seed)
+    return deduplicate(Scholarship(f"{rng.choice(titles)} {i % 40}", f"https://h/{i}", rng.choice(SOURCES))
+                       for i in range(size))
+
+def random_users(size, seed):
+    rng = random.Random(seed)
+    return [UserInput(rng.choice(DEPARTMENTS), rng.choice(list(Level)), rng.randint(1, 4), rng.choice(list(Identity)),
+                      rng.choice(list(StudyType)))
+            for _ in range(size)]
+
+class BatchMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.crawler = ScholarshipCrawler.__new__(ScholarshipCrawler)
+        self.users = random_users(300, seed=11)
+
+    def assert_matches_filter_scholarships(self, scholarships, users, **options):
+        expected = [self.crawler.filter_scholarships(scholarships, user) for user in users]
+        for data in (scholarships, ScholarshipColumns(scholarships)):
+            for user, got, want in zip(users, BatchMatcher(data).match(users, **options), expected):
+                self.assertEqual(got, want, user)
+
+    def test_matches_filter_scholarships(self):
+        self.assert_matches_filter_scholarships(corpus(TITLES, 400, seed=1), self.users)
+
+    def test_matches_relaxed_fallback(self):
+        scholarships = corpus(NON_LOCAL_TITLES, 60, seed=2)
+        index = BatchMatcher(scholarships).index
+        self.assertTrue(any(not (identity | level | department)
+                            for identity, level, department in map(index.match_masks, self.users)))
+        self.assert_matches_filter_scholarships(scholarships, self.users)
+
+    def test_process_sharded_matches_filter_scholarships(self):
+        for scholarships in (corpus(TITLES, 400, seed=3), corpus(NON_LOCAL_TITLES, 60, seed=4)):
+            self.assert_matches_filter_scholarships(scholarships, self.users, processes=2, chunk_size=8)
+
+    def test_users_with_same_profile_share_ids(self):
+        matcher = BatchMatcher(corpus(TITLES, 100, seed=5))
+        user = self.users[0]
+        twin = UserInput(user.department, user.level, user.year + 1, user.identity, user.study_type)
+        first, second = matcher.match_ids([user, twin])
+        self.assertIs(first, second)
+
+if __name__ == "__main__":
+    unittest.main()
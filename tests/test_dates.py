@@ -0,0 +1,70 @@
+"""日期文字的解析與依日期、截止狀態的篩選"""
+import sys
+import unittest
+from datetime import date as Date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import Scholarship, ScholarshipCrawler, filter_by_date, is_still_open, parse_date
+
+class ParseDateTest(unittest.TestCase):
+    def test_western_formats(self):
+        for text in ("2024-01-02", "2024/1/2", "1/2/2024", "2024年1月2日", "2024.01.02", "公告日期：2024-01-02 10:30"):
+            with self.subTest(text=text):
+                self.assertEqual(parse_date(text), Date(2024, 1, 2))
+
+    def test_roc_formats(self):
+        for text in ("113/01/02", "113-1-2", "民國113/1/2", "113年1月2日", "民國 113 年 1 月 2 日", "民國113.01.02"):
+            with self.subTest(text=text):
+                self.assertEqual(parse_date(text), Date(2024, 1, 2))
+
+    def test_version_like_numbers_are_not_dates(self):
+        for text in ("版本 100.2.3", "v113.1.2", "1.113.1.2", "113.1.2", "第 150/1/2 號", "3.14"):
+            with self.subTest(text=text):
+                self.assertIsNone(parse_date(text))
+
+    def test_invalid_or_missing_dates(self):
+        for text in ("2024-02-30", "113/13/01", "", None, "近期公告"):
+            with self.subTest(text=text):
+                self.assertIsNone(parse_date(text))
+
+    def test_extracted_text_parses_to_same_date(self):
+        crawler = ScholarshipCrawler(backend="http")
+        self.addCleanup(crawler.close)
+        for text in ("截止 113/03/05 止", "民國113.3.5 前", "113年3月5日截止", "2024.03.05"):
+            with self.subTest(text=text):
+                extracted = crawler.extract_date_from_text(text)
+                self.assertTrue(crawler.is_date_format(text))
+                self.assertEqual(parse_date(extracted), Date(2024, 3, 5))
+        self.assertEqual(crawler.extract_date_from_text("版本 100.2.3"), "")
+
+class DateFilterTest(unittest.TestCase):
+    def posting(self, title, published_on=None, deadline_on=None, status=""):
+        return Scholarship(title=title, url=f"https://h/{title}", source="生輔組", status=status,
+                           published_on=published_on, deadline_on=deadline_on)
+
+    def test_still_open(self):
+        today = Date(2024, 3, 10)
+        self.assertTrue(is_still_open(self.posting("a", deadline_on=Date(2024, 3, 10)), today))
+        self.assertFalse(is_still_open(self.posting("a", deadline_on=Date(2024, 3, 9)), today))
+        # 截止日期已知時不看狀態
+        self.assertTrue(is_still_open(self.posting("a", deadline_on=Date(2024, 4, 1), status="截止"), today))
+        self.assertFalse(is_still_open(self.posting("研究生獎學金 截止", status="截止"), today))
+        self.assertTrue(is_still_open(self.posting("研究生獎學金 即將截止", status="截止"), today))
+        self.assertTrue(is_still_open(self.posting("研究生獎學金 延長截止", status="截止"), today))
+
+    def test_filter_by_date_range_keeps_undated(self):
+        items = [self.posting("old", Date(2024, 1, 1)), self.posting("new", Date(2024, 3, 1)), self.posting("undated")]
+        kept = filter_by_date(items, since=Date(2024, 2, 1), until=Date(2024, 3, 31))
+        self.assertEqual([s.title for s in kept], ["new", "undated"])
+
+    def test_filter_open_only(self):
+        today = Date(2024, 3, 10)
+        items = [self.posting("past", deadline_on=Date(2024, 3, 1)), self.posting("future", deadline_on=Date(2024, 4, 1)),
+                 self.posting("closed", status="截止"), self.posting("即將截止", status="截止")]
+        kept = filter_by_date(items, open_only=True, today=today)
+        self.assertEqual([s.title for s in kept], ["future", "即將截止"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""跨來源重複項目的合併：真正重複的公告要合併，不同學制、身分、期別的公告不可合併"""
+import sys
+import unittest
+from datetime import date as Date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import Scholarship, deduplicate, posted_by, simhash
+
+def posting(title, source, url=None, published_on=Date(2024, 3, 1)):
+    return Scholarship(title=title, url=url or f"https://{source}.example.org/{abs(hash(title))}", source=source,
+                       published_on=published_on)
+
+class DeduplicateTest(unittest.TestCase):
+    def test_same_url_is_merged(self):
+        first = posting("中華扶輪教育基金會 研究生獎學金", "生輔組", "https://a.example.org/1?utm_source=x")
+        second = posting("中華扶輪教育基金會研究生獎學金", "資工系", "https://A.example.org/1/")
+        merged = deduplicate([first, second])
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(posted_by(merged[0]), ("生輔組", "資工系"))
+
+    def test_reformatted_title_from_other_source_is_merged(self):
+        merged = deduplicate([
+            posting("教育部 弱勢學生助學計畫 生活學習獎助金", "生輔組"),
+            posting("教育部弱勢學生助學計畫「生活學習獎助金」", "僑陸組"),
+            posting("教育部弱勢學生助學計畫生活學習獎助金申請", "資工系")
+        ])
+        self.assertEqual([s.title for s in merged], ["教育部 弱勢學生助學計畫 生活學習獎助金"])
+        self.assertEqual(posted_by(merged[0]), ("生輔組", "僑陸組", "資工系"))
+
+    def test_different_level_is_not_merged(self):
+        master, doctoral = "碩士班研究生獎助學金申請", "博士班研究生獎助學金申請"
+        # 兩者的 SimHash 很接近，只能靠學制分類區分
+        self.assertLessEqual(bin(simhash(master) ^ simhash(doctoral)).count("1"), 6)
+        merged = deduplicate([posting(master, "生輔組"), posting(doctoral, "資工系")])
+        self.assertEqual([s.title for s in merged], [master, doctoral])
+
+    def test_different_identity_is_not_merged(self):
+        merged = deduplicate([posting("學業優良獎學金 申請公告", "生輔組"), posting("僑生學業優良獎學金 申請公告", "僑陸組")])
+        self.assertEqual(len(merged), 2)
+
+    def test_different_numbers_are_not_merged(self):
+        merged = deduplicate([posting("113學年度 研究生獎學金", "生輔組"), posting("114學年度 研究生獎學金", "資工系")])
+        self.assertEqual(len(merged), 2)
+
+    def test_same_source_is_not_merged(self):
+        merged = deduplicate([posting("研究生獎學金 開放申請", "生輔組"), posting("研究生獎學金開放申請", "生輔組")])
+        self.assertEqual(len(merged), 2)
+
+    def test_distant_dates_are_not_merged(self):
+        merged = deduplicate([posting("研究生獎學金 開放申請", "生輔組", published_on=Date(2023, 3, 1)),
+                              posting("研究生獎學金開放申請", "資工系", published_on=Date(2024, 3, 1))])
+        self.assertEqual(len(merged), 2)
+
+    def test_each_source_merges_once_into_a_record(self):
+        titles = ["研究生獎學金 開放申請", "研究生獎學金開放申請"]
+        items = [posting(titles[i % 2], source, f"https://h/{source}/{i}")
+                 for i in range(6) for source in ("生輔組", "資工系", "僑陸組")]
+        merged = deduplicate(items)
+        self.assertEqual(len(merged), 6)
+        self.assertTrue(all(posted_by(s) == ("生輔組", "資工系", "僑陸組") for s in merged))
+
+    def test_templated_titles_with_distinct_numbers_stay_separate(self):
+        items = [posting(f"第{i}號 研究生獎助學金", ("生輔組", "資工系")[i % 2]) for i in range(2000)]
+        self.assertEqual(len(deduplicate(items)), 2000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+"""重試、斷路器與過期快取回退，以本機可控制失敗次數的 HTTP 伺服器模擬不穩定的網站"""
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import selenium_scholarship
+from selenium.common.exceptions import InvalidSelectorException, InvalidSessionIdException, TimeoutException, \
+    WebDriverException
+from selenium_scholarship import (
+    CircuitBreaker, CircuitOpenError, CrawlRun, HostRateLimiter, PageCache, RetryPolicy, ScholarshipCrawler
+)
+
+FIXTURE = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "csie.html"
+
+class FlakyServer:
+    """前 failures 個請求回應 status，之後回應資工系的列表頁快照"""
+    def __init__(self):
+        self.failures = 0
+        self.status = 503
+        self.retry_after = None
+        self.requests = 0
+        server = self
+        body = FIXTURE.read_bytes()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.failures > 0:
+                    server.failures -= 1
+                    self.send_response(server.status)
+                    if server.retry_after is not None:
+                        self.send_header("Retry-After", str(server.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.url = f"{self.base_url}/zh_tw/Announcements/11"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class FetchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = FlakyServer()
+        self.addCleanup(self.server.close)
+        self.crawler = ScholarshipCrawler(
+            backend="http",
+            rate_limiter=HostRateLimiter(max_concurrency=4, requests_per_second=0),
+            retry_policy=RetryPolicy(attempts=3, base_delay=0.01, max_delay=0.05),
+            circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        )
+        self.addCleanup(self.crawler.close)
+        self.crawler.sources["資工系"].url = self.server.url
+        self.crawler.sources["資工系"].base_url = self.server.base_url
+        self.host = self.server.base_url[len("http://"):]
+
+    def crawl(self):
+        run = CrawlRun()
+        return self.crawler.crawl_source("資工系", max_pages=1, run=run), run
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_backoff_doubles_up_to_max_delay(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=3, jitter=0)
+        self.assertEqual([policy.delay(n) for n in range(1, 5)], [0.5, 1, 2, 3])
+
+    def test_jitter_stays_within_bounds(self):
+        policy = RetryPolicy(base_delay=1, max_delay=10, jitter=0.5)
+        delays = [policy.delay(2) for _ in range(200)]
+        self.assertTrue(all(1 <= delay <= 3 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_retry_after_is_honoured(self):
+        error = mock.Mock(response=mock.Mock(headers={"Retry-After": "4"}))
+        self.assertEqual(RetryPolicy(base_delay=0.1, max_delay=10, jitter=0).delay(1, error), 4)
+
+    def test_selenium_errors_are_classified(self):
+        policy = RetryPolicy()
+        self.assertEqual(policy.classify(TimeoutException("page load")), "host")
+        self.assertEqual(policy.classify(WebDriverException("unknown error: net::ERR_CONNECTION_RESET")), "host")
+        self.assertEqual(policy.classify(InvalidSessionIdException("invalid session id")), "session")
+        self.assertEqual(policy.classify(WebDriverException("chrome not reachable")), "session")
+        self.assertIsNone(policy.classify(InvalidSelectorException("invalid selector")))
+        self.assertFalse(policy.is_retryable(InvalidSessionIdException("invalid session id")))
+
+class RetryTest(FetchTestCase):
+    def test_transient_errors_are_retried(self):
+        self.server.failures = 2
+        with mock.patch.object(selenium_scholarship, "sleep_interruptibly") as sleep:
+            items, run = self.crawl()
+        self.assertEqual(self.server.requests, 3)
+        # 限速等待也會呼叫 sleep_interruptibly (等待時間不大於 0)
+        backoffs = [call.args[0] for call in sleep.call_args_list if call.args[0] > 0]
+        self.assertEqual(len(backoffs), 2)
+        self.assertGreater(len(items), 0)
+        self.assertIsNone(run.error)
+
+    def test_gives_up_after_last_attempt(self):
+        self.server.failures = 10
+        items, run = self.crawl()
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(items, [])
+        self.assertEqual(run.stop_reason, "error")
+
+    def test_client_errors_are_not_retried(self):
+        self.server.failures = 1
+        self.server.status = 404
+        items, run = self.crawl()
+        self.assertEqual(self.server.requests, 1)
+        self.assertIsNotNone(run.error)
+        self.assertFalse(self.crawler.circuit_breaker.is_open(self.host))
+
+    def test_session_errors_do_not_count_against_host(self):
+        def fetch():
+            raise InvalidSessionIdException("invalid session id")
+
+        for _ in range(5):
+            with self.assertRaises(InvalidSessionIdException):
+                self.crawler.fetch_with_retry("資工系", self.server.url, fetch)
+        self.assertFalse(self.crawler.circuit_breaker.is_open(self.host))
+
+class CircuitBreakerTest(FetchTestCase):
+    def test_opens_after_consecutive_failures(self):
+        self.server.failures = 3
+        self.crawl()
+        self.assertTrue(self.crawler.circuit_breaker.is_open(self.host))
+
+        # 開啟期間不送出請求
+        requests_before = self.server.requests
+        items, run = self.crawl()
+        self.assertEqual(self.server.requests, requests_before)
+        self.assertIsInstance(run.error, CircuitOpenError)
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = self.crawler.circuit_breaker
+        self.server.failures = 3
+        self.crawl()
+        with mock.patch.object(selenium_scholarship.time, "monotonic",
+                               return_value=selenium_scholarship.time.monotonic() + 61):
+            self.assertEqual(breaker.states()[self.host], "half_open")
+            items, run = self.crawl()
+        self.assertGreater(len(items), 0)
+        self.assertEqual(breaker.states()[self.host], "closed")
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure("h")
+        breaker.before_request("h")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request("h")
+
+        # 試探失敗即再次開啟
+        self.assertTrue(breaker.record_failure("h"))
+        breaker.reset_timeout = 60
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request("h")
+
+class StaleFallbackTest(FetchTestCase):
+    def test_serves_last_good_cached_result(self):
+        self.crawler.cache = PageCache(":memory:", default_ttl=0)
+        fresh, run = self.crawl()
+        self.assertFalse(run.stale)
+
+        self.server.failures = 10
+        stale, run = self.crawl()
+        self.assertTrue(run.stale)
+        self.assertIsNone(run.error)
+        self.assertEqual([s.title for s in stale], [s.title for s in fresh])
+
+    def test_fails_without_cached_result(self):
+        self.server.failures = 10
+        items, run = self.crawl()
+        self.assertFalse(run.stale)
+        self.assertIsNotNone(run.error)
+
+if __name__ == "__main__":
+    unittest.main()
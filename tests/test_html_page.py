@@ -0,0 +1,137 @@
+"""HtmlPage/HtmlElement 與列表頁解析，以 benchmarks/fixtures/ 的網站快照驗證"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from urllib.parse import urljoin
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium_scholarship import HtmlElement, HtmlPage, ScholarshipCrawler, ScholarshipFinder
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+# 來源 -> (快照檔名, 以 XPath 寫成的列表項目查詢, 項目數)
+FIXTURES = {
+    "生輔組": ("student_affairs.html", "//table[contains(@class, 'table')]/tbody/tr", 12),
+    "資工系": ("csie.html", "//div[contains(@class, 'announcement-list')]/div[contains(@class, 'item')]", 12),
+    "僑陸組": ("overseas_affairs.html", "//div[contains(@class, 'content-list')]/div[contains(@class, 'item')]", 12)
+}
+
+class HtmlPageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.crawler = ScholarshipCrawler(backend="http")
+        self.addCleanup(self.crawler.close)
+
+    def load(self, source_name):
+        filename = FIXTURES[source_name][0]
+        return HtmlPage(self.crawler.sources[source_name].url, (FIXTURE_DIR / filename).read_bytes())
+
+class HtmlElementTest(HtmlPageTestCase):
+    def test_table_row_text_matches_browser_layout(self):
+        row = self.load("生輔組").find_element(By.CSS_SELECTOR, "table.table tbody tr")
+        self.assertEqual(row.text, "2024-03-18 財團法人永信李天德醫藥基金會 113年度清寒獎學金 2024-04-12 受理中")
+
+    def test_block_children_are_separated_by_newlines(self):
+        document = HtmlPage("https://example.org/", b"<html><body><div><p> a  b </p><script>x()</script><p>c<br>d</p></div></body></html>")
+        self.assertEqual(document.find_element(By.TAG_NAME, "div").text, "a b\nc\nd")
+
+    def test_find_element_by_tag_css_and_xpath(self):
+        page = self.load("資工系")
+        item = page.find_element(By.CSS_SELECTOR, "div.announcement-list .item")
+        self.assertIsInstance(item, HtmlElement)
+        link = item.find_element(By.TAG_NAME, "a")
+        self.assertEqual(link.tag_name, "a")
+        self.assertEqual(link.text, "113學年度 碩士班研究生獎助學金 開放申請")
+        # 相對連結在載入時已補全
+        self.assertEqual(link.get_attribute("href"), "https://www.csie.ntu.edu.tw/zh_tw/Announcements/11/4812")
+        self.assertEqual(item.find_element(By.XPATH, ".//span[@class='date']").text, "2024-03-20")
+
+    def test_find_element_raises_when_missing(self):
+        page = self.load("僑陸組")
+        with self.assertRaises(NoSuchElementException):
+            page.find_element(By.CSS_SELECTOR, "table.table tbody tr")
+        self.assertEqual(page.find_elements(By.CSS_SELECTOR, "table.table tbody tr"), [])
+
+class ParseListPageTest(HtmlPageTestCase):
+    def expected_items(self, source_name):
+        """直接以 lxml 與 XPath 取出列表項目的標題與連結，略過非獎學金公告"""
+        filename, xpath, _ = FIXTURES[source_name]
+        document = lxml_html.fromstring((FIXTURE_DIR / filename).read_bytes())
+        expected = []
+        for node in document.xpath(xpath):
+            link = node.xpath(".//a")[0]
+            title = " ".join(link.text_content().split())
+            if self.crawler.is_scholarship_related(title):
+                expected.append((title, urljoin(self.crawler.sources[source_name].url, link.get("href"))))
+        return expected
+
+    def test_selectors_find_every_list_item(self):
+        for source_name, (_, _, count) in FIXTURES.items():
+            with self.subTest(source=source_name):
+                items, query = self.crawler.probe_selectors(self.crawler.sources[source_name], self.load(source_name))
+                self.assertEqual(len(items), count)
+                self.assertEqual(query[0], By.CSS_SELECTOR)
+
+    def test_parse_list_page_yields_same_items_as_xpath(self):
+        for source_name in FIXTURES:
+            with self.subTest(source=source_name):
+                scholarships = self.crawler.parse_list_page(self.crawler.sources[source_name], self.load(source_name))
+                self.assertEqual([(s.title, s.url) for s in scholarships], self.expected_items(source_name))
+                self.assertTrue(all(s.source == source_name and s.date for s in scholarships))
+
+    def test_remembered_selector_gives_same_items(self):
+        source = self.crawler.sources["資工系"]
+        first = self.crawler.parse_list_page(source, self.load("資工系"))
+        self.assertIsNotNone(self.crawler.selector_memory.get("資工系"))
+        second = self.crawler.parse_list_page(source, self.load("資工系"))
+        self.assertEqual(second, first)
+
+    def test_remembered_selector_persists_across_runs(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = str(Path(directory.name) / "selectors.db")
+        for run in range(2):
+            finder = ScholarshipFinder(selector_path=path)
+            try:
+                crawler = finder.crawler
+                if run == 1:
+                    self.assertEqual(crawler.selector_memory.get("資工系"),
+                                     ((By.CSS_SELECTOR, "div.announcement-list .item"), 12))
+                page = HtmlPage(crawler.sources["資工系"].url, (FIXTURE_DIR / "csie.html").read_bytes())
+                crawler.parse_list_page(crawler.sources["資工系"], page)
+                stats = crawler.selector_memory.stats()["資工系"]
+            finally:
+                finder.close()
+        # 第二次執行直接使用記住的選擇器，不再逐一嘗試
+        self.assertEqual((stats["probes"], stats["hits"]), (1, 1))
+
+    def test_later_pages_do_not_change_remembered_count(self):
+        source = self.crawler.sources["資工系"]
+        memory = self.crawler.selector_memory
+        self.crawler.parse_list_page(source, self.load("資工系"))
+        query, count = memory.get("資工系")
+
+        # 最後一頁只剩 2 個項目
+        short = self.load("資工系")
+        for node in short.node.xpath(FIXTURES["資工系"][1])[2:]:
+            node.getparent().remove(node)
+        scholarships = self.crawler.parse_list_page(source, short, first_page=False)
+
+        self.assertEqual([s.title for s in scholarships], [title for title, _ in self.expected_items("資工系")[:2]])
+        self.assertEqual(memory.get("資工系"), (query, count))
+        self.assertEqual(memory.stats()["資工系"]["probes"], 1)
+
+    def test_selector_drift_is_counted(self):
+        source = self.crawler.sources["資工系"]
+        self.crawler.selector_memory.probed("資工系", (By.CSS_SELECTOR, "ul.news li"), 12)
+        scholarships = self.crawler.parse_list_page(source, self.load("資工系"))
+        self.assertEqual(len(scholarships), len(self.expected_items("資工系")))
+        counters = [c for c in self.crawler.metrics.snapshot()["counters"] if c["name"] == "selector_drift_total"]
+        self.assertEqual([(c["labels"], c["value"]) for c in counters], [({"source": "資工系"}, 1)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""ScholarshipIndex 的查詢結果須與逐筆篩選相同"""
+import random
+import sys
+import unittest
+from datetime import date as Date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import (
+    Identity, Level, Scholarship, ScholarshipColumns, ScholarshipCrawler, ScholarshipIndex, StudyType, UserInput,
+    deduplicate, filter_by_date
+)
+
+TITLES = [
+    "碩士班研究生獎助學金 開放申請", "博士班研究生獎學金 即將截止", "大學部清寒助學金 截止", "僑生學業優良獎學金",
+    "外籍生 International Scholarship", "資工系 系務會議紀錄", "原住民族學生助學金 延長截止", "電機系 碩士 獎學金 受理中"
+]
+SOURCES = ["生輔組", "資工系", "僑陸組"]
+# 只有非本國生的項目，多數條件沒有嚴格匹配，會走放寬條件
+NON_LOCAL_TITLES = ["外籍生工讀金", "僑生清寒助學金", "外籍生 International Grant", "僑生 生活補助"]
+DEPARTMENTS = ["資工系", "電機系", "資工", "系", "機械系"]
+
+def random_corpus(size, seed):
+    rng = random.Random(seed)
+
+    def some_date(missing):
+        return None if rng.random() < missing else Date(2023, 1, 1) + timedelta(days=rng.randint(0, 600))
+
+    return [
+        Scholarship(title=f"{rng.choice(TITLES)} {i}", url=f"https://h/{i}", source=rng.choice(SOURCES),
+                    status=rng.choice(["", "截止", "受理中"]), published_on=some_date(0.2), deadline_on=some_date(0.5))
+        for i in range(size)
+    ]
+
+def ids(index, mask):
+    return {doc_id for doc_id in range(len(index)) if mask >> doc_id & 1}
+
+def all_users():
+    return [UserInput(department, level, 1, identity, StudyType.FULL_TIME)
+            for department in DEPARTMENTS for level in Level for identity in Identity]
+
+def filter_scholarships(scholarships, user):
+    return ScholarshipCrawler.__new__(ScholarshipCrawler).filter_scholarships(scholarships, user)
+
+class ScholarshipIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.scholarships = random_corpus(400, seed=7)
+        self.user = UserInput("資工系", Level.MASTER, 1, Identity.LOCAL, StudyType.FULL_TIME)
+
+    def test_date_mask_matches_filter_by_date(self):
+        rng = random.Random(3)
+        today = Date(2024, 3, 10)
+        for index in (ScholarshipIndex(self.scholarships), ScholarshipIndex(ScholarshipColumns(self.scholarships))):
+            for _ in range(100):
+                since = rng.choice([None, Date(2023, 1, 1) + timedelta(days=rng.randint(0, 600))])
+                until = rng.choice([None, Date(2023, 1, 1) + timedelta(days=rng.randint(0, 600))])
+                open_only = rng.random() < 0.5
+                expected = {i for i, s in enumerate(self.scholarships)
+                            if filter_by_date([s], since, until, open_only, today)}
+                self.assertEqual(ids(index, index.date_mask(since, until, open_only, today)), expected,
+                                 (since, until, open_only))
+
+    def test_filter_matches_filter_scholarships(self):
+        rng = random.Random(5)
+        non_local = [Scholarship(f"{rng.choice(NON_LOCAL_TITLES)} {i}", f"https://n/{i}", rng.choice(SOURCES + ["電機系"]))
+                     for i in range(30)]
+        fallbacks = 0
+        for scholarships in (deduplicate(self.scholarships), non_local):
+            for index in (ScholarshipIndex(scholarships), ScholarshipIndex(ScholarshipColumns(scholarships))):
+                within = index.date_mask(Date(2023, 6, 1))
+                candidates = [s for doc_id, s in enumerate(scholarships) if within >> doc_id & 1]
+                for user in all_users():
+                    identity, level, department = index.match_masks(user)
+                    fallbacks += not (identity | level | department)
+                    self.assertEqual(index.filter(user), filter_scholarships(scholarships, user), user)
+                    self.assertEqual(index.filter(user, within), filter_scholarships(candidates, user), user)
+        self.assertTrue(fallbacks)
+
+    def test_date_mask_sees_added_items(self):
+        index = ScholarshipIndex(self.scholarships[:10])
+        index.date_mask(Date(2023, 6, 1))
+        doc_id = index.add(Scholarship("研究生獎學金", "https://h/new", "生輔組", published_on=Date(2024, 5, 1)))
+        self.assertIn(doc_id, ids(index, index.date_mask(Date(2024, 4, 1))))
+
+    def test_title_contains(self):
+        index = ScholarshipIndex(ScholarshipColumns(self.scholarships))
+        for text in ("碩", "研究生", "學業優良獎學金", "international", "不存在"):
+            expected = {i for i, s in enumerate(self.scholarships) if text in s.title.lower()}
+            self.assertEqual(ids(index, index.title_contains(text)), expected, text)
+
+    def test_search_pages_through_results(self):
+        index = ScholarshipIndex(self.scholarships)
+        total = index.search(self.user, page=1, page_size=7)["total"]
+        pages = [index.search(self.user, page=page, page_size=7)["data"] for page in range(1, total // 7 + 2)]
+        seen = [s.url for page in pages for s in page]
+        self.assertEqual(len(seen), total)
+        self.assertEqual(len(set(seen)), total)
+        self.assertEqual(index.search(self.user, page=total // 7 + 2, page_size=7)["data"], [])
+
+    def test_search_rejects_invalid_paging(self):
+        index = ScholarshipIndex(self.scholarships)
+        for page, page_size in ((0, 20), (-1, 20), (1, 0), (1, -5)):
+            with self.assertRaises(ValueError):
+                index.search(self.user, page=page, page_size=page_size)
+
+if __name__ == "__main__":
+    unittest.main()
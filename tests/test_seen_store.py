@@ -0,0 +1,56 @@
+"""SeenStore 的新增、變更與移除事件"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import Scholarship, SeenStore, parse_date
+
+def posting(n, date, status="受理中", source="生輔組"):
+    return Scholarship(title=f"獎學金 {n}", url=f"http://h/{n}", source=source, date=date, status=status,
+                       published_on=parse_date(date))
+
+class SeenStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = SeenStore(":memory:")
+        self.addCleanup(self.store.close)
+
+    def changes(self, scholarships, stop_reason="max_pages", source="生輔組"):
+        return [(event["type"], event["key"]) for event in self.store.apply(source, scholarships, stop_reason)]
+
+    def test_new_changed_and_removed(self):
+        first = [posting(1, "2024-03-03"), posting(2, "2024-03-02"), posting(3, "2024-03-01")]
+        self.assertEqual(self.changes(first, "end"), [("new", "http://h/1"), ("new", "http://h/2"), ("new", "http://h/3")])
+        self.assertEqual(self.changes(first, "end"), [])
+
+        second = [posting(1, "2024-03-03", status="已截止"), posting(3, "2024-03-01")]
+        self.assertEqual(self.changes(second, "end"), [("changed", "http://h/1"), ("removed", "http://h/2")])
+        self.assertEqual(self.store.keys("生輔組"), {"http://h/1", "http://h/3"})
+
+    def test_item_sharing_last_date_on_uncrawled_page_is_not_removed(self):
+        items = [posting(1, "2024-03-03"), posting(2, "2024-03-02"), posting(3, "2024-03-02")]
+        self.changes(items, "end")
+
+        # 爬到第 2 個項目就停止，第 3 個項目同一天但在下一頁
+        self.assertEqual(self.changes(items[:2], "seen"), [])
+        self.assertEqual(self.changes(items, "end"), [])
+
+    def test_newer_item_missing_within_crawled_range_is_removed(self):
+        self.changes([posting(1, "2024-03-04"), posting(2, "2024-03-03"), posting(3, "2024-03-01")], "end")
+        self.assertEqual(self.changes([posting(1, "2024-03-04"), posting(3, "2024-03-01")], "seen"),
+                         [("removed", "http://h/2")])
+
+    def test_failed_crawl_removes_nothing(self):
+        self.changes([posting(1, "2024-03-03")], "end")
+        self.assertEqual(self.changes([], "error"), [])
+
+    def test_sources_are_tracked_separately(self):
+        item = posting(1, "2024-03-03")
+        self.changes([item], "end", source="生輔組")
+        self.assertEqual(self.changes([item], "end", source="資工系"), [("new", "http://h/1")])
+        self.assertEqual(self.changes([], "end", source="資工系"), [("removed", "http://h/1")])
+        self.assertEqual(self.store.keys("生輔組"), {"http://h/1"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""常駐服務 /query 的參數檢查與回應"""
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium_scholarship import (
+    Scholarship, ScholarshipColumns, ScholarshipFinder, ScholarshipIndex, ScholarshipService, ScholarshipSnapshot
+)
+
+class HandleQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.finder = ScholarshipFinder()
+        self.addCleanup(self.finder.close)
+        self.service = ScholarshipService(self.finder, port=0)
+        self.addCleanup(self.service.server.server_close)
+
+    def publish(self):
+        columns = ScholarshipColumns([
+            Scholarship("資工系 碩士班研究生獎學金", "https://h/1", "資工系"),
+            Scholarship("電機系 博士班獎學金", "https://h/2", "生輔組"),
+            Scholarship("大學部清寒助學金", "https://h/3", "生輔組")
+        ])
+        self.finder._snapshots.append(ScholarshipSnapshot(1, datetime.now(), columns, {}, ScholarshipIndex(columns)))
+
+    def test_no_snapshot_yet(self):
+        self.assertEqual(self.service.handle_query({"department": "資工系"})[0], 503)
+
+    def test_department_is_required(self):
+        self.publish()
+        for params in ({}, {"department": ""}, {"department": "  "}):
+            status, body = self.service.handle_query(params)
+            self.assertEqual(status, 400, params)
+            self.assertIn("department", body["error"])
+
+    def test_invalid_paging_is_rejected(self):
+        self.publish()
+        for paging in ({"page": "0"}, {"page": "-1"}, {"page": "1", "page_size": "0"}, {"page": "x"}):
+            status, _ = self.service.handle_query({"department": "資工系", **paging})
+            self.assertEqual(status, 400, paging)
+
+    def test_query(self):
+        self.publish()
+        status, body = self.service.handle_query({"department": "資工系", "level": "碩士", "page": "1"})
+        self.assertEqual(status, 200)
+        # 符合全部條件的項目排在最前面
+        self.assertEqual(body["total"], 3)
+        self.assertEqual(body["data"][0]["url"], "https://h/1")
+        self.assertEqual(self.service.handle_query({"department": "資工系", "version": "9"})[0], 404)
+
+if __name__ == "__main__":
+    unittest.main()